@@ -0,0 +1,143 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, NamedTuple, Union
+
+import sympy as sp
+
+BACKENDS = ("numpy", "math", "numba")
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+class FunctionCache(object):
+    """
+    A bounded LRU cache of sympy expressions compiled into numeric functions, and of their derivatives.
+    Entries are keyed on the canonical form of the expression, so equal expressions built
+    independently share one compiled function.
+    @param `maxsize`: the maximum number of entries.
+    """
+    def __init__(self, maxsize: int = 512):
+        assert maxsize > 0, "maxsize must be positive"
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _canonical(expr: Any) -> Any:
+        """A hashable canonical form of expressions, symbols, matrices and sequences of them."""
+        if isinstance(expr, (list, tuple)):
+            return tuple(FunctionCache._canonical(e) for e in expr)
+        if isinstance(expr, sp.MatrixBase):
+            return sp.ImmutableMatrix(expr)
+        return sp.sympify(expr)
+
+    def _lookup(self, key: tuple, build: Callable) -> Any:
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            self.misses += 1
+            value = build()
+            self._entries[key] = value
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            return value
+
+    def diff(self, expr: Any, symbol: sp.Symbol, n: int = 1) -> Any:
+        """
+        @param `expr`: the expression.
+        @param `symbol`: the variable.
+        @param `n`: the order of the derivative.
+        @return: the `n`-th derivative of `expr` with respect to `symbol`.
+        """
+        expr = self._canonical(expr)
+        if n == 0:
+            return expr
+        return self._lookup(("diff", expr, symbol, n), lambda: sp.diff(expr, symbol, n))
+
+    def lambdify(
+        self,
+        args: Any,
+        expr: Any,
+        modules: Union[str, list] = "numpy",
+        derivative: int = 0,
+        cse: bool = False
+    ) -> Callable:
+        """
+        Cached `sympy.lambdify`.
+        @param `args`: the symbol or the sequence of symbols of the function.
+        @param `expr`: the expression.
+        @param `modules`: the numeric backend, as in `sympy.lambdify`.
+        @param `derivative`: compile the derivative of this order with respect to the first symbol instead.
+        @param `cse`: eliminate common subexpressions before compiling.
+        @return: the numeric function.
+        """
+        expr = self._canonical(expr)
+        symbols = self._canonical(args)
+        first = symbols[0] if isinstance(symbols, tuple) else symbols
+        key = ("lambdify", symbols, expr, modules if isinstance(modules, str) else repr(modules), derivative, cse)
+
+        def build() -> Callable:
+            target = self.diff(expr, first, derivative)
+            return sp.lambdify(args, target, modules, cse=cse)
+        return self._lookup(key, build)
+
+    def compile(
+        self,
+        args: Any,
+        expr: Any,
+        backend: str = "numpy",
+        derivative: int = 0,
+        cse: bool = False
+    ) -> Callable:
+        """
+        Compile `expr` for one of the `BACKENDS`, `numpy` for arrays, `math` for fast scalar loops
+        and `numba` for a JIT compiled version of the `math` function.
+        @param `args`: the symbol or the sequence of symbols of the function.
+        @param `expr`: the expression.
+        @param `backend`: the numeric backend.
+        @param `derivative`: compile the derivative of this order with respect to the first symbol instead.
+        @param `cse`: eliminate common subexpressions before compiling.
+        @return: the numeric function.
+        """
+        assert backend in BACKENDS, "Unknown backend {}.".format(backend)
+        if backend != "numba":
+            return self.lambdify(args, expr, backend, derivative, cse)
+
+        try:
+            import numba
+        except ImportError as error:
+            raise ImportError("The numba backend requires numba to be installed.") from error
+        function = self.lambdify(args, expr, "math", derivative, cse)
+        key = ("numba", self._canonical(args), self._canonical(expr), derivative, cse)
+        return self._lookup(key, lambda: numba.njit(function))
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+# the process-wide cache shared by all the solvers
+FUNCTIONS = FunctionCache()
+
+def lambdify(args: Any, expr: Any, modules: Union[str, list] = "numpy", derivative: int = 0, cse: bool = False) -> Callable:
+    """`FunctionCache.lambdify` on the process-wide cache."""
+    return FUNCTIONS.lambdify(args, expr, modules, derivative, cse)
+
+def compileFunction(args: Any, expr: Any, backend: str = "numpy", derivative: int = 0, cse: bool = False) -> Callable:
+    """`FunctionCache.compile` on the process-wide cache."""
+    return FUNCTIONS.compile(args, expr, backend, derivative, cse)
+
+def diff(expr: Any, symbol: sp.Symbol, n: int = 1) -> Any:
+    """`FunctionCache.diff` on the process-wide cache."""
+    return FUNCTIONS.diff(expr, symbol, n)
@@ -1,29 +1,294 @@
-from typing import Iterable, Optional, Union
+import sys
+from fractions import Fraction
+from typing import Iterable, Optional, Tuple, Union
 
 import numpy as np
 
+# number of points the compensated Horner scheme evaluates at once
+COMPENSATED_BLOCK = 16384
+
+class Polynomial(object):
+    """
+    A polynomial in nested form `c_0 + (x + b_{n-1})(c_1 + ... + (x + b_0)c_n)`, whose arrays
+    are reordered and stored contiguously once so that repeated evaluations cost only the Horner loop.
+    """
+    def __init__(self, coefficients: Iterable, base_points: Optional[Iterable] = None):
+        """
+        @param `coefficients`: coefficients array from lower to higher order.
+            A 2D array holds one polynomial per row.
+        @param `base_points`: base points in evaluatation, one row per polynomial in batched mode.
+        """
+        coefficients = np.asarray(coefficients)
+        assert coefficients.ndim in (1, 2), "coefficients must be a 1D or 2D array"
+        self.batched = coefficients.ndim == 2
+        self.degree = coefficients.shape[-1] - 1
+
+        # columns from higher to lower order, each one broadcasts against the points
+        self.coefficients = np.ascontiguousarray(np.moveaxis(coefficients[..., ::-1], -1, 0))
+        if base_points is None:
+            self.base_points = None
+        else:
+            # only the first `degree` base points are used, as `nest` always did
+            base_points = np.asarray(base_points)
+            assert base_points.shape[:-1] == coefficients.shape[:-1] and base_points.shape[-1] >= self.degree, "need one base point per coefficient but the last"
+            base_points = base_points[..., :self.degree]
+            self.base_points = np.ascontiguousarray(np.moveaxis(base_points, -1, 0))
+
+    def _columns(self, x: np.ndarray) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """In batched mode each column is broadcast as a `(P, 1)` column against a non-scalar `x`."""
+        coeffs, bases = self.coefficients, self.base_points
+        if self.batched and x.ndim > 0:
+            coeffs = coeffs[..., np.newaxis]
+            bases = None if bases is None else bases[..., np.newaxis]
+        return coeffs, bases
+
+    def _buffer(self, x: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        shape = np.broadcast_shapes(self._columns(x)[0].shape[1:], x.shape)
+        if out is None:
+            arrays = (x, self.coefficients) if self.base_points is None else (x, self.coefficients, self.base_points)
+            out = np.empty(shape, dtype=np.result_type(*arrays))
+        else:
+            assert out.shape == shape, "out must have shape {}".format(shape)
+        return out
+
+    def __call__(self, x: Union[float, Iterable], out: Optional[np.ndarray] = None) -> Union[float, np.ndarray]:
+        """
+        @param `x`: the point to evaluate.
+        @param `out`: optional buffer receiving the result, it must have the broadcast shape.
+        @return: the value at point `x`.
+        """
+        x = np.asarray(x)
+        coeffs, bases = self._columns(x)
+        out = self._buffer(x, out)
+
+        # the hot loop only works in place, `scratch` is the single temporary for `x + base_point`
+        out[...] = coeffs[0]
+        if bases is None:
+            for c in coeffs[1:]:
+                np.multiply(out, x, out=out)
+                np.add(out, c, out=out)
+        else:
+            scratch = np.empty_like(out)
+            for c, b in zip(coeffs[1:], bases):
+                np.add(x, b, out=scratch)
+                np.multiply(out, scratch, out=out)
+                np.add(out, c, out=out)
+
+        return out[()] if out.ndim == 0 else out
+
+    def derivatives(self, x: Union[float, Iterable], second: bool = False) -> tuple:
+        """
+        Evaluate the polynomial and its derivatives in a single Horner pass.
+        @param `x`: the point to evaluate.
+        @param `second`: whether to evaluate the second derivative as well.
+        @return: `p(x), p'(x)` or `p(x), p'(x), p''(x)`.
+        """
+        x = np.asarray(x)
+        coeffs, bases = self._columns(x)
+        p = self._buffer(x)
+        dp, ddp = np.zeros_like(p), np.zeros_like(p)
+        s = x if bases is None else np.empty_like(p)
+
+        p[...] = coeffs[0]
+        for i, c in enumerate(coeffs[1:]):
+            if bases is not None:
+                np.add(x, bases[i], out=s)
+            # (p s + c)' = p' s + p, (p s + c)'' = p'' s + 2 p'
+            if second:
+                ddp *= s
+                ddp += dp
+                ddp += dp
+            dp *= s
+            dp += p
+            p *= s
+            p += c
+
+        values = (p, dp, ddp) if second else (p, dp)
+        return tuple(v[()] if v.ndim == 0 else v for v in values)
+
+    def compensated(self, x: Union[float, Iterable]) -> Union[float, np.ndarray]:
+        """
+        Compensated Horner scheme, the rounding errors of every step are caught by `twoSum` and `twoProduct`
+        and evaluated alongside, giving about twice the working precision.
+        Like `__call__` the loop only works in place, and it runs over blocks of `COMPENSATED_BLOCK` points
+        whose buffers stay in cache across the twenty or so passes of every step.
+        @param `x`: the point to evaluate.
+        @return: the value at point `x`.
+        """
+        x = np.asarray(x, dtype=float)
+        coeffs, bases = self._columns(x)
+        y = np.empty(self._buffer(x).shape, dtype=float)
+        if y.ndim == 0:
+            self._compensated(x, coeffs, bases, y)
+            return y[()]
+
+        # blocks run along the last axis, which the columns only span for a batch at a single point
+        x = np.broadcast_to(x, y.shape)
+        spanned = coeffs.ndim > 1 and coeffs.shape[-1] > 1
+        size = y.shape[-1]
+        block = max(1, COMPENSATED_BLOCK * size // y.size)
+        buffers = [np.empty(y.shape[:-1] + (min(block, size),)) for _ in range(10)]
+        for start in range(0, size, block):
+            end = min(start + block, size)
+            self._compensated(
+                x[..., start:end],
+                coeffs[..., start:end] if spanned else coeffs,
+                None if bases is None else bases[..., start:end] if spanned else bases,
+                y[..., start:end],
+                [b[..., :end - start] for b in buffers]
+            )
+        return y
+
+    def _compensated(
+        self,
+        x: np.ndarray,
+        coeffs: np.ndarray,
+        bases: Optional[np.ndarray],
+        y: np.ndarray,
+        buffers: Optional[list] = None
+    ) -> None:
+        """The compensated Horner scheme on a block of points, writing the values into `y`."""
+        if buffers is None:
+            buffers = [np.empty_like(y) for _ in range(10)]
+        error, p, hi, lo, t, u, s, es, s_hi, s_lo = buffers
+        y[...] = coeffs[0]
+        error[...] = 0.0
+        if bases is None:
+            # the multiplier is `x` at every step, so it is split only once
+            s = x
+            np.multiply(s, 134217729.0, out=t)
+            np.subtract(t, s, out=s_hi)
+            np.subtract(t, s_hi, out=s_hi)
+            np.subtract(s, s_hi, out=s_lo)
+
+        for i, c in enumerate(coeffs[1:]):
+            if bases is not None:
+                # s + es = x + b
+                np.add(x, bases[i], out=s)
+                np.subtract(s, x, out=t)
+                np.subtract(s, t, out=u)
+                np.subtract(x, u, out=u)
+                np.subtract(bases[i], t, out=es)
+                np.add(es, u, out=es)
+                # error = error s + y es
+                np.multiply(y, es, out=t)
+                np.multiply(error, s, out=error)
+                np.add(error, t, out=error)
+                np.multiply(s, 134217729.0, out=t)
+                np.subtract(t, s, out=s_hi)
+                np.subtract(t, s_hi, out=s_hi)
+                np.subtract(s, s_hi, out=s_lo)
+            else:
+                np.multiply(error, s, out=error)
+
+            # p + ep = y s, with Veltkamp's splitting of y, and ep added to the error
+            np.multiply(y, s, out=p)
+            np.multiply(y, 134217729.0, out=t)
+            np.subtract(t, y, out=hi)
+            np.subtract(t, hi, out=hi)
+            np.subtract(y, hi, out=lo)
+            np.multiply(hi, s_hi, out=t)
+            np.subtract(p, t, out=t)
+            np.multiply(lo, s_hi, out=u)
+            np.subtract(t, u, out=t)
+            np.multiply(hi, s_lo, out=u)
+            np.subtract(t, u, out=t)
+            np.multiply(lo, s_lo, out=u)
+            np.subtract(u, t, out=u)
+            np.add(error, u, out=error)
+
+            # y + ec = p + c, and ec added to the error
+            np.add(p, c, out=y)
+            np.subtract(y, p, out=t)
+            np.subtract(y, t, out=u)
+            np.subtract(p, u, out=u)
+            np.add(error, u, out=error)
+            np.subtract(c, t, out=u)
+            np.add(error, u, out=error)
+
+        y += error
+
+    def roots(self, method: str = "aberth", max_iterations: int = 100) -> np.ndarray:
+        """
+        All the complex roots of a polynomial in monomial form.
+        @param `method`: `aberth` for the Aberth-Ehrlich simultaneous iteration on the Horner scheme,
+            `companion` for the eigenvalues of the companion matrix.
+        @param `max_iterations`: the maximum number of Aberth-Ehrlich iterations.
+        @return: the roots sorted by real then imaginary part, of shape `(degree,)`, or `(P, degree)` in batched mode.
+        """
+        assert method in ("aberth", "companion"), "Unknown method {}.".format(method)
+        assert self.base_points is None, "roots need the polynomial in monomial form"
+        assert self.degree >= 1, "a constant has no roots"
+        leading = self.coefficients[0]
+        assert np.all(leading != 0), "the leading coefficient must be nonzero"
+        # coefficients of the monic polynomial from x^{n-1} down to x^0, along the last axis
+        monic = np.moveaxis(self.coefficients[1:] / leading, 0, -1)
+
+        if method == "companion":
+            n = self.degree
+            companion = np.zeros(monic.shape[:-1] + (n, n), dtype=monic.dtype)
+            companion[..., 0, :] = -monic
+            companion[..., np.arange(1, n), np.arange(n - 1)] = 1.0
+            roots = np.linalg.eigvals(companion).astype(complex)
+        else:
+            roots = self._aberth(monic, max_iterations)
+        return np.sort(roots, axis=-1)
+
+    def _aberth(self, monic: np.ndarray, max_iterations: int) -> np.ndarray:
+        """Aberth-Ehrlich iteration, every root is refined by Newton's step repelled from the other roots."""
+        n = self.degree
+        # start on a circle around the centroid of the roots, with Fujiwara's bound as radius,
+        # rotated so that no starting point is real
+        center = -monic[..., :1] / n
+        radius = np.max(np.abs(monic) ** (1.0 / np.arange(1, n + 1)), axis=-1, keepdims=True)
+        radius = np.where(radius == 0.0, 1.0, radius)
+        z = center + radius * np.exp(1j * (2.0 * np.pi * np.arange(n) / n + 0.4))
+
+        active = np.ones(z.shape, dtype=bool)
+        diagonal = np.eye(n, dtype=bool)
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            for _ in range(max_iterations):
+                p, dp = self.derivatives(z)
+                difference = z[..., :, np.newaxis] - z[..., np.newaxis, :]
+                difference[..., diagonal] = np.inf
+                repulsion = np.sum(1.0 / difference, axis=-1)
+                # w = (p / p') / (1 - (p / p') repulsion), vanishing at exact roots
+                w = 1.0 / (dp / p - repulsion)
+                w = np.where(active & np.isfinite(w), w, 0.0)
+                z -= w
+                active &= np.abs(w) > 4.0 * sys.float_info.epsilon * np.abs(z) + sys.float_info.min
+                if not active.any():
+                    break
+        return z
+
 def nest(
     x: Union[float, Iterable],
     coefficients: Iterable,
-    base_points: Optional[Iterable] = None
-) -> float:
+    base_points: Optional[Iterable] = None,
+    out: Optional[np.ndarray] = None,
+    compensated: bool = False
+) -> Union[float, np.ndarray]:
     """
     @param `x`: the point to evaluate.
     @param `coefficients`: coefficients array from lower to higher order.
-    @param `base_points`: base points in evaluatation.
+        A 2D array holds one polynomial per row.
+    @param `base_points`: base points in evaluatation, one row per polynomial in batched mode.
+    @param `out`: optional buffer receiving the result, it must have the broadcast shape.
+    @param `compensated`: use the compensated Horner scheme for about twice the working precision.
     @return: the value at point `x`.
-    """
-    x, y = np.asarray(x), coefficients[-1]
-    coeffs = np.asarray(coefficients[-2::-1])
-    if base_points is None:
-        base_points = np.zeros_like(coeffs)
-    else:
-        base_points = np.asarray(base_points)
 
-    for i in range(coeffs.shape[0]):
-        y = y * (x + base_points[i]) + coeffs[i]
-
-    return y
+    In batched mode each coefficient column is broadcast as a `(P, 1)` column against `x`,
+    so a points array of shape `(N,)` or `(P, N)` gives a `(P, N)` result.
+    Build a `Polynomial` instead when the same coefficients are evaluated repeatedly.
+    """
+    polynomial = Polynomial(coefficients, base_points)
+    if compensated:
+        y = polynomial.compensated(x)
+        if out is None:
+            return y
+        out[...] = y
+        return out
+    return polynomial(x, out)
 
 def quadratic(a: float, b: float, c: float) -> tuple:
     """Solve the equation `ax^2 + bx + c = 0`."""
@@ -40,6 +305,224 @@ def quadratic(a: float, b: float, c: float) -> tuple:
 
     return solution
 
+def quadraticBatch(
+    a: Union[float, Iterable],
+    b: Union[float, Iterable],
+    c: Union[float, Iterable],
+    complex_roots: bool = False
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Solve the equations `ax^2 + bx + c = 0` for whole arrays of coefficients at once.
+
+    @param `a, b, c`: the coefficients, broadcast against each other.
+    @param `complex_roots`: return complex roots instead of real ones.
+    @return: the roots of shape `(..., 2)` and a mask of the same shape marking the valid roots.
+        A root is invalid if it is not real (unless `complex_roots` is set) or does not exist,
+        invalid roots are NaN. Equations with `a = 0` are solved as linear ones.
+    """
+    a, b, c = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (a, b, c)))
+    Delta = b * b - 4.0 * a * c
+    quadratic = a != 0.0
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sqrt = np.sqrt(Delta.astype(complex)) if complex_roots else np.sqrt(Delta)
+        # q has the sign of b, so that b + sign(b) sqrt(Delta) never cancels
+        q = -0.5 * (b + np.copysign(1.0, b) * sqrt)
+        x1 = q / a
+        x2 = np.where(q == 0.0, x1, c / q)
+        linear = -c / b
+
+    roots = np.stack([np.where(quadratic, x1, linear), np.where(quadratic, x2, linear)], axis=-1)
+    valid = np.where(quadratic, True if complex_roots else Delta >= 0.0, b != 0.0)
+    mask = np.stack([valid, valid], axis=-1)
+    roots[~mask] = np.nan
+    return roots, mask
+
+def cubicBatch(
+    a: Union[float, Iterable],
+    b: Union[float, Iterable],
+    c: Union[float, Iterable],
+    d: Union[float, Iterable],
+    complex_roots: bool = False
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Solve the equations `ax^3 + bx^2 + cx + d = 0` for whole arrays of coefficients at once,
+    with the trigonometric form for three real roots and Cardano's form otherwise.
+
+    @param `a, b, c, d`: the coefficients, broadcast against each other.
+    @param `complex_roots`: return complex roots instead of real ones.
+    @return: the roots of shape `(..., 3)` and a mask of the same shape marking the valid roots.
+        A root is invalid if it is not real (unless `complex_roots` is set) or does not exist,
+        invalid roots are NaN. Equations with `a = 0` are solved by `quadraticBatch`.
+    """
+    a, b, c, d = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (a, b, c, d)))
+    cubic = a != 0.0
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        B, C, D = b / a, c / a, d / a
+        Q = (B * B - 3.0 * C) / 9.0
+        R = (2.0 * B * B * B - 9.0 * B * C + 27.0 * D) / 54.0
+        shift = B / 3.0
+        # R^2 - Q^3 is zero at a double root, up to the rounding errors of the largest terms of R and Q
+        error = 16.0 * sys.float_info.epsilon * (
+            2.0 * np.abs(R) * (np.abs(2.0 * B * B * B) + np.abs(9.0 * B * C) + np.abs(27.0 * D)) / 54.0
+            + 3.0 * Q * Q * (B * B + np.abs(3.0 * C)) / 9.0
+        )
+        three = R * R - Q * Q * Q <= error
+
+        # three real roots, where Q may be slightly negative at a triple root
+        P = np.maximum(Q, 0.0)
+        theta = np.arccos(np.clip(np.where(P > 0.0, R / np.sqrt(P * P * P), 0.0), -1.0, 1.0))
+        scale = -2.0 * np.sqrt(P)
+        trigonometric = [scale * np.cos((theta + 2.0 * np.pi * k) / 3.0) - shift for k in (0, 1, -1)]
+
+        # one real root and a complex conjugate pair
+        A = -np.copysign(1.0, R) * np.cbrt(np.abs(R) + np.sqrt(R * R - Q * Q * Q))
+        AB = np.where(A == 0.0, 0.0, Q / A)
+        real = -0.5 * (A + AB) - shift
+        imag = 0.5 * np.sqrt(3.0) * (A - AB)
+        cardano = [A + AB - shift + 0j, real + 1j * imag, real - 1j * imag]
+
+    roots = np.stack([np.where(three, t, z) for t, z in zip(trigonometric, cardano)], axis=-1)
+    is_real = np.stack([np.ones_like(three), three | (imag == 0.0), three | (imag == 0.0)], axis=-1)
+
+    degenerate, degenerate_mask = quadraticBatch(b, c, d, complex_roots)
+    roots[..., :2] = np.where(cubic[..., np.newaxis], roots[..., :2], degenerate)
+    roots[..., 2] = np.where(cubic, roots[..., 2], np.nan)
+    mask = np.stack([
+        np.where(cubic, True if complex_roots else is_real[..., i], degenerate_mask[..., i]) for i in range(2)
+    ] + [cubic & (True if complex_roots else is_real[..., 2])], axis=-1)
+
+    # the closed forms lose digits on widely separated roots, polish them with guarded Newton steps
+    polynomial = Polynomial(np.stack([d, c, b, a], axis=-1).reshape(-1, 4))
+    flat = roots.reshape(-1, 3)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        for _ in range(2):
+            p, dp = polynomial.derivatives(flat)
+            step = flat - p / dp
+            accept = np.abs(polynomial(step)) < np.abs(p)
+            flat = np.where(accept, step, flat)
+    roots = flat.reshape(roots.shape)
+
+    if not complex_roots:
+        roots = roots.real
+    roots[~mask] = np.nan
+    return roots, mask
+
+def twoSum(a: Union[float, np.ndarray], b: Union[float, np.ndarray]) -> tuple:
+    """
+    Error-free transformation of a sum, `a + b = s + e` exactly, where `s = fl(a + b)`.
+    @return: `s, e`
+    """
+    s = a + b
+    bb = s - a
+    e = (a - (s - bb)) + (b - bb)
+    return s, e
+
+def _split(a: Union[float, np.ndarray]) -> tuple:
+    """Veltkamp's splitting of a double into two halves of 26 bits, `a = hi + lo` exactly."""
+    c = 134217729.0 * a
+    hi = c - (c - a)
+    return hi, a - hi
+
+def twoProduct(a: Union[float, np.ndarray], b: Union[float, np.ndarray]) -> tuple:
+    """
+    Error-free transformation of a product, `a * b = p + e` exactly, where `p = fl(a * b)`.
+    @return: `p, e`
+    """
+    p = a * b
+    ah, al = _split(a)
+    bh, bl = _split(b)
+    e = al * bl - (((p - ah * bh) - al * bh) - ah * bl)
+    return p, e
+
+# number of independent accumulators the compensated summations run side by side
+SUMMATION_LANES = 8192
+
+def _compensatedSum(x: np.ndarray, kahan: bool) -> np.ndarray:
+    """
+    Compensated sum of `x` over its first axis, with about `SUMMATION_LANES` accumulators running as a vector
+    on buffers updated in place. The accumulators are then folded pairwise by `twoSum`.
+    """
+    n, rest = x.shape[0], x.shape[1:]
+    if n == 0:
+        return np.zeros(rest)
+    # a power of two of lanes along the first axis, no more than needed
+    lanes = max(1, SUMMATION_LANES // max(1, int(np.prod(rest))))
+    lanes = min(1 << (lanes.bit_length() - 1), 1 << (n - 1).bit_length())
+    m = n // lanes
+    s, c, y, t, w = (np.zeros((lanes,) + rest) for _ in range(5))
+
+    def update(v: np.ndarray, s: np.ndarray, c: np.ndarray, y: np.ndarray, t: np.ndarray, w: np.ndarray) -> None:
+        """Add `v` to the accumulators, the new sums are left in `t`."""
+        if kahan:
+            # c holds the negated low part lost by the last addition
+            np.subtract(v, c, out=y)
+            np.add(s, y, out=t)
+            np.subtract(t, s, out=c)
+            np.subtract(c, y, out=c)
+        else:
+            # twoSum(s, v) = t + e, e added to c
+            np.add(s, v, out=t)
+            np.subtract(t, s, out=y)
+            np.subtract(t, y, out=w)
+            np.subtract(s, w, out=w)
+            np.add(c, w, out=c)
+            np.subtract(v, y, out=y)
+            np.add(c, y, out=c)
+
+    for v in x[:m * lanes].reshape((m, lanes) + rest):
+        update(v, s, c, y, t, w)
+        s, t = t, s
+    r = n - m * lanes
+    if r:
+        update(x[m * lanes:], s[:r], c[:r], y[:r], t[:r], w[:r])
+        s[:r] = t[:r]
+    if kahan:
+        c = -c
+
+    while s.shape[0] > 1:
+        half = s.shape[0] // 2
+        s, e = twoSum(s[:half], s[half:])
+        c = c[:half] + c[half:] + e
+    return s[0] + c[0]
+
+def kahanSum(x: Iterable, axis: int = -1) -> Union[float, np.ndarray]:
+    """
+    Kahan's compensated summation.
+    @param `x`: the array to sum.
+    @param `axis`: the axis to sum over.
+    @return: the sum.
+    """
+    total = _compensatedSum(np.moveaxis(np.asarray(x, dtype=float), axis, 0), kahan=True)
+    return total[()] if total.ndim == 0 else total
+
+def neumaierSum(x: Iterable, axis: int = -1) -> Union[float, np.ndarray]:
+    """
+    Neumaier's compensated summation, which unlike Kahan's keeps the error of adding a term larger than the sum.
+    @param `x`: the array to sum.
+    @param `axis`: the axis to sum over.
+    @return: the sum.
+    """
+    total = _compensatedSum(np.moveaxis(np.asarray(x, dtype=float), axis, 0), kahan=False)
+    return total[()] if total.ndim == 0 else total
+
+def pairwiseSum(x: Iterable, axis: int = -1) -> Union[float, np.ndarray]:
+    """
+    Pairwise summation, the rounding error grows as `O(log n)` rather than `O(n)`.
+    @param `x`: the array to sum.
+    @param `axis`: the axis to sum over.
+    @return: the sum.
+    """
+    x = np.moveaxis(np.asarray(x, dtype=float), axis, 0)
+    if x.shape[0] == 0:
+        return np.zeros(x.shape[1:])[()]
+    while x.shape[0] > 1:
+        half = x.shape[0] // 2
+        pairs = x[:half] + x[half:2 * half]
+        x = np.concatenate([pairs, x[2 * half:]]) if x.shape[0] % 2 else pairs
+    return x[0][()]
+
 def dec2bin(deci: Union[float, str], fraction_len: int = 10) -> str:
     """
     Convert a decimal formed number into binary form
@@ -83,44 +566,98 @@ def dec2bin(deci: Union[float, str], fraction_len: int = 10) -> str:
     result = ''.join(result)
     return result
 
-def bin2dec(bina: str, recur_pos: tuple = None) -> float:
+def bin2dec(bina: str, recur_pos: tuple = None, exact: bool = False) -> Union[float, Fraction]:
     """
     Convert a binary formed number into decimal form
 
     @param `bina`: the binary number
     @param `recur_pos`: the start and the end of the recurring fraction after the binary point
+    @param `exact`: return the exact rational value instead of the nearest float
     @return: the decimal number
     """
 
     num = str(bina)
     binary_point = num.find('.')
-    if recur_pos != None:
+    if binary_point != -1:
+        integer, fraction = num[:binary_point], num[binary_point + 1:]
+    else:
+        integer, fraction = num, ''
+
+    # the value is kept as an exact ratio of integers, and rounded to float only once
+    if recur_pos is not None:
         start, end = recur_pos
-        x = num[:binary_point] + num[binary_point + 1:]
-        y = num[:binary_point] + num[binary_point + 1: binary_point + start + 1]
-        x_coefficient = list(map(int, x))
-        x_coefficient.reverse()
-        x_result = nest(2, x_coefficient)
-        y_coefficient = list(map(int, y))
-        y_coefficient.reverse()
-        y_result = nest(2, y_coefficient)
-
-        x_scale = 2 << end
-        y_scale = 1 << start
-        return (x_result - y_result) / (x_scale - y_scale)
+        # (2^(end + 1) - 2^start) * x removes the recurring part
+        x = int(integer + fraction[:end + 1] or '0', 2)
+        y = int(integer + fraction[:start] or '0', 2)
+        numerator, denominator = x - y, (1 << (end + 1)) - (1 << start)
     else:
-        if binary_point != -1:
-            integer = num[:binary_point]
-            fraction = '0' + num[binary_point + 1:]
-        else:
-            integer = num
-            fraction = '0'
+        numerator, denominator = int(integer + fraction or '0', 2), 1 << len(fraction)
 
-        integer_coefficient = list(map(int, integer))
-        integer_coefficient.reverse()
-        result = nest(2, integer_coefficient)
+    if exact:
+        return Fraction(numerator, denominator)
+    return numerator / denominator
 
-        fraction_coefficient = list(map(int, fraction))
-        result += nest(0.5, fraction_coefficient)
+# unsigned integer type, exponent bits and mantissa bits of the IEEE-754 formats
+IEEE754 = {
+    np.dtype(np.float16): (np.uint16, 5, 10),
+    np.dtype(np.float32): (np.uint32, 8, 23),
+    np.dtype(np.float64): (np.uint64, 11, 52),
+}
 
-    return result
+def floatFields(deci: Union[float, Iterable], dtype: type = np.float64) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Split floating point numbers into their IEEE-754 fields by reading the bit pattern directly.
+
+    @param `deci`: the decimal numbers
+    @param `dtype`: the floating point format, `np.float16`, `np.float32` or `np.float64`
+    @return: the sign, the biased exponent and the mantissa as unsigned integer arrays
+    """
+    dtype = np.dtype(dtype)
+    assert dtype in IEEE754, "unsupported floating point format {}".format(dtype)
+    uint, exponent_len, mantissa_len = IEEE754[dtype]
+
+    bits = np.asarray(deci, dtype=dtype).view(uint)
+    sign = bits >> uint(exponent_len + mantissa_len)
+    exponent = (bits >> uint(mantissa_len)) & uint((1 << exponent_len) - 1)
+    mantissa = bits & uint((1 << mantissa_len) - 1)
+    return sign, exponent, mantissa
+
+def dec2binBatch(deci: Union[float, Iterable], dtype: type = np.float64, as_bytes: bool = False) -> np.ndarray:
+    """
+    Convert decimal numbers into their fixed-width IEEE-754 binary form, sign bit first.
+
+    @param `deci`: the decimal numbers
+    @param `dtype`: the floating point format, `np.float16`, `np.float32` or `np.float64`
+    @param `as_bytes`: return byte strings such as `b'0011...'` instead of bit arrays
+    @return: an array of shape `(..., width)` holding 0 and 1, or an array of byte strings
+    """
+    dtype = np.dtype(dtype)
+    assert dtype in IEEE754, "unsupported floating point format {}".format(dtype)
+
+    # big endian bytes so that the bits come out from the sign bit to the last mantissa bit
+    deci = np.asarray(deci, dtype=dtype.newbyteorder('>'))
+    octets = deci.reshape(deci.shape + (1,)).view(np.uint8)
+    bits = np.unpackbits(octets, axis=-1)
+    if as_bytes:
+        bits += ord('0')
+        return bits.view('S{}'.format(bits.shape[-1]))[..., 0]
+    return bits
+
+def bin2decBatch(bina: Union[Iterable, np.ndarray], dtype: type = np.float64) -> np.ndarray:
+    """
+    Convert fixed-width IEEE-754 binary forms back into decimal numbers.
+
+    @param `bina`: bit arrays of shape `(..., width)` or an array of byte strings, sign bit first
+    @param `dtype`: the floating point format, `np.float16`, `np.float32` or `np.float64`
+    @return: the decimal numbers
+    """
+    dtype = np.dtype(dtype)
+    assert dtype in IEEE754, "unsupported floating point format {}".format(dtype)
+
+    bina = np.asarray(bina)
+    if bina.dtype.kind == 'S':
+        bina = np.frombuffer(bina.tobytes(), dtype=np.uint8).reshape(bina.shape + (-1,)) - ord('0')
+    assert bina.shape[-1] == 8 * dtype.itemsize, "need {} bits per number".format(8 * dtype.itemsize)
+
+    octets = np.packbits(bina.astype(np.uint8, copy=False), axis=-1)
+    return np.ascontiguousarray(octets).view(dtype.newbyteorder('>'))[..., 0].astype(dtype)
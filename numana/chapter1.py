@@ -1,110 +1,805 @@
+import math
+import pickle
 import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Iterable, NamedTuple, Optional, Tuple, Union
 
 import numpy as np
 import sympy as sp
 import sympy.abc
 
+from .cache import compileFunction, lambdify
+from .chapter0 import Polynomial
+from .dual import derivative as dualDerivative
+
+class SolverResult(NamedTuple):
+    """The record of one run of a `Solver` method."""
+    root: float
+    iterations: int
+    evaluations: int
+    derivative_evaluations: int
+    # |f| at the last iterate
+    residual: float
+    time: float
+    converged: bool
+    # (x, f(x)) of every iterate, if asked for
+    trace: Optional[list] = None
+
+class Stopping(object):
+    """
+    The stopping policy shared by the methods of `Solver`.
+    @param `xtol`: the absolute tolerance of the step `|x_{k+1} - x_k|` (or of the width of a bracket).
+    @param `rtol`: the relative tolerance of the step, scaled by `|x_{k+1}|`.
+    @param `ftol`: the tolerance of the residual `|f(x)|`.
+    @param `max_iterations`: the maximum number of iterations.
+    @param `max_evaluations`: the maximum number of evaluations of `f` and `f'`, unbounded if `None`.
+
+    The defaults stop on `|x_{k+1} - x_k| <= 2 epsilon max(1, |x_{k+1}|)` or on an exact zero.
+    """
+    def __init__(
+        self,
+        xtol: float = 2.0 * sys.float_info.epsilon,
+        rtol: float = 2.0 * sys.float_info.epsilon,
+        ftol: float = 0.0,
+        max_iterations: int = 1000,
+        max_evaluations: Optional[int] = None
+    ):
+        assert xtol >= 0.0 and rtol >= 0.0 and ftol >= 0.0, "Tolerances must be non-negative."
+        assert max_iterations > 0, "max_iterations must be positive."
+        self.xtol = xtol
+        self.rtol = rtol
+        self.ftol = ftol
+        self.max_iterations = max_iterations
+        self.max_evaluations = max_evaluations
+
+    def tolerance(self, x: float) -> float:
+        """The tolerance of a step landing at `x`."""
+        return max(self.xtol, self.rtol * abs(x))
+
+class Monitor(object):
+    """
+    Counts the evaluations and the iterations of one run of a `Solver` method, and applies its `Stopping` policy.
+    @param `f, df`: the function and its derivative to count.
+    @param `stopping`: the stopping policy, `Stopping()` if `None`.
+    @param `callback`: called as `callback(iteration, x, fx)` after every iteration.
+    @param `trace`: keep the `(x, fx)` of every iteration.
+    """
+    def __init__(
+        self,
+        f: Callable,
+        df: Optional[Callable] = None,
+        stopping: Optional[Stopping] = None,
+        callback: Optional[Callable] = None,
+        trace: bool = False
+    ):
+        self._f, self._df = f, df
+        self.stopping = stopping if stopping is not None else Stopping()
+        self.callback = callback
+        self.trace = [] if trace else None
+        self.iterations = 0
+        self.evaluations = 0
+        self.derivative_evaluations = 0
+        self.residual = math.nan
+        # an iterate or a residual overflowed to infinity or became not a number
+        self.diverged = False
+        self.start = time.perf_counter()
+
+    def f(self, x):
+        self.evaluations += 1
+        return self._f(x)
+
+    def df(self, x):
+        self.derivative_evaluations += 1
+        return self._df(x)
+
+    def count(self, evaluations: int, derivative_evaluations: int = 0) -> None:
+        """Count evaluations made outside of `f` and `df`."""
+        self.evaluations += evaluations
+        self.derivative_evaluations += derivative_evaluations
+
+    def iterate(self, x, fx) -> None:
+        """Record the new iterate `x` with its residual `fx`."""
+        self.iterations += 1
+        self.residual = abs(fx)
+        if not (np.all(np.isfinite(x)) and np.all(np.isfinite(fx))):
+            self.diverged = True
+        if self.trace is not None:
+            self.trace.append((x, fx))
+        if self.callback is not None:
+            self.callback(self.iterations, x, fx)
+
+    def close(self, a, b) -> bool:
+        """Whether the step from `a` to `b` is within the tolerance, never for a step to infinity."""
+        step = abs(b - a)
+        return np.isfinite(step) and step <= self.stopping.tolerance(b)
+
+    def small(self, fx) -> bool:
+        """Whether the residual `fx` is within the tolerance."""
+        return abs(fx) <= self.stopping.ftol
+
+    def exhausted(self) -> bool:
+        """Whether the iterations or the evaluations ran out, or the iterates diverged."""
+        stopping = self.stopping
+        if self.diverged or self.iterations >= stopping.max_iterations:
+            return True
+        return stopping.max_evaluations is not None and self.evaluations + self.derivative_evaluations >= stopping.max_evaluations
+
+    def result(self, root, converged: bool, full_output: bool) -> Union[float, SolverResult]:
+        """The `root` alone, or the whole record if `full_output`."""
+        if not full_output:
+            return root
+        return SolverResult(
+            root, self.iterations, self.evaluations, self.derivative_evaluations,
+            self.residual, time.perf_counter() - self.start, bool(converged), self.trace
+        )
+
+def _divide(a, b):
+    """`a / b`, infinite or not a number for native floats as well, instead of raising `ZeroDivisionError`."""
+    try:
+        return a / b
+    except ZeroDivisionError:
+        if a == 0.0 or a != a:
+            return math.nan
+        return math.copysign(math.inf, a) * math.copysign(1.0, b)
+
+def _ieee(f: Callable) -> Callable:
+    """
+    `f` on native floats returning infinity or not a number like numpy,
+    where the `math` functions raise on overflows and outside of their domains.
+    """
+    def g(*args):
+        try:
+            return f(*args)
+        except (OverflowError, ValueError, ZeroDivisionError):
+            return math.nan
+    return g
+
+def _aitken(x0, x1, x2):
+    """Aitken's delta-squared extrapolation of three successive iterates, `x2` if the differences vanish."""
+    denominator = (x2 - x1) - (x1 - x0)
+    if denominator == 0.0:
+        return x2
+    return x2 - (x2 - x1) ** 2 / denominator
+
+def andersonMixing(
+    g: Callable,
+    x: np.ndarray,
+    depth: int = 5,
+    stopping: Optional[Stopping] = None,
+    full_output: bool = False,
+    callback: Optional[Callable] = None,
+    trace: bool = False
+) -> Union[np.ndarray, SolverResult]:
+    """
+    Anderson mixing for the fixed point `x = g(x)` of a vector function.
+    The next iterate combines the last `depth` values of `g` with the weights that minimize
+    the least squares norm of the combined residual `g(x) - x`.
+    @param `g`: the function, from and to arrays of the shape of `x`.
+    @param `x`: the initial value.
+    @param `depth`: the number of previous iterates mixed in, `0` is the plain fixed point iteration.
+    @param `stopping`: the stopping policy, applied to the max norms of the steps and the residuals.
+    @return: the fixed point, or a `SolverResult` with `full_output`.
+    """
+    assert depth >= 0, "depth must be non-negative."
+    monitor = Monitor(g, stopping=stopping, callback=callback, trace=trace)
+    stopping = monitor.stopping
+    x = np.array(x, dtype=float)
+    gx = np.asarray(monitor.f(x), dtype=float)
+    r = gx - x
+    step = math.inf
+    # differences of successive values of `g` and of the residuals
+    dg, dr = deque(maxlen=depth), deque(maxlen=depth)
+
+    while True:
+        residual = float(np.max(np.abs(r)))
+        monitor.iterate(x, residual)
+        if residual <= stopping.ftol or step <= stopping.tolerance(float(np.max(np.abs(x)))):
+            return monitor.result(x, True, full_output)
+        if monitor.exhausted():
+            return monitor.result(x, False, full_output)
+
+        if dr:
+            gamma = np.linalg.lstsq(np.stack(dr, axis=-1), r.ravel(), rcond=None)[0]
+            x_new = gx - (np.stack(dg, axis=-1) @ gamma).reshape(x.shape)
+        else:
+            x_new = gx
+        g_new = np.asarray(monitor.f(x_new), dtype=float)
+        r_new = g_new - x_new
+        dg.append((g_new - gx).ravel())
+        dr.append((r_new - r).ravel())
+        step = float(np.max(np.abs(x_new - x)))
+        x, gx, r = x_new, g_new, r_new
+
+def _picklable(f: Any) -> bool:
+    """Whether `f` can be sent to a worker process."""
+    try:
+        pickle.dumps(f)
+    except (pickle.PicklingError, AttributeError, TypeError):
+        return False
+    return True
+
+def _refine(f: Union[sp.Expr, Callable], parameters: tuple, method: str, a: np.ndarray, b: np.ndarray, args: tuple, stopping: Optional[Stopping]) -> np.ndarray:
+    """Refine brackets in a worker process, where the `Solver` is rebuilt from its expression or its function."""
+    return getattr(Solver(f, parameters), method + "Batch")(a, b, args, stopping)[0]
+
 class Solver(object):
+    """
+    Solvers for the equation `f(x) = 0`.
+    @param `f`: the expression of `x` to solve, or a numpy compatible function `f(x, *parameters)`.
+        Functions have no `symbol_f` and are differentiated with dual numbers.
+    @param `parameters`: extra symbols of `f`, only the batch methods take values for them.
+    @param `backend`: how `f` is evaluated in the scalar methods, `numpy`, `math` or `numba`.
+        `math` and `numba` iterate on native floats, the batch methods always use `numpy`.
+        A function is called as is, the backend only sets whether it is given 0-d arrays or floats.
+
+    Every method stops as told by a `Stopping` policy, `Stopping()` if not given.
+    The scalar methods return the root, or a `SolverResult` with `full_output`.
+    `callback(iteration, x, fx)` is called after every iteration and `trace` keeps every iterate.
+    """
     epsilon = sys.float_info.epsilon
 
-    def __init__(self, f: sp.Function):
+    def __init__(self, f: Union[sp.Expr, Callable], parameters: Iterable = (), backend: str = "numpy"):
+        self.parameters = tuple(parameters)
+        self.backend = backend
+        if callable(f) and not isinstance(f, sp.Basic):
+            self.symbol_f = None
+            self.numeric_f = self.vector_f = f
+            return
         self.symbol_f = f
-        self.numeric_f = sp.lambdify(sympy.abc.x, f, "numpy")
+        self.numeric_f = compileFunction([sympy.abc.x, *self.parameters], f, backend)
+        if backend != "numpy":
+            self.numeric_f = _ieee(self.numeric_f)
+        self.vector_f = self.numeric_f if backend == "numpy" else lambdify([sympy.abc.x, *self.parameters], f, "numpy")
+
+    def _scalar(self, a: float):
+        """Starting value of the scalar methods, 0-d float arrays for `numpy` and native floats otherwise."""
+        if self.backend != "numpy":
+            return float(a)
+        # integers would wrap around instead of overflowing to infinity
+        a = np.asarray(a)
+        return a if np.issubdtype(a.dtype, np.inexact) else a.astype(float)
 
-    def symbolic(self) -> list:
+    def polynomial(self) -> Optional[Polynomial]:
+        """The `f` as a `Polynomial` if it is a polynomial with real numeric coefficients, else `None`."""
+        if not hasattr(self, "_polynomial"):
+            self._polynomial = None
+            if self.symbol_f is not None and self.symbol_f.is_polynomial(sympy.abc.x):
+                try:
+                    coefficients = [float(c) for c in sp.Poly(self.symbol_f, sympy.abc.x).all_coeffs()]
+                    self._polynomial = Polynomial(coefficients[::-1])
+                except TypeError:
+                    pass
+        return self._polynomial
+
+    def symbolic(self, numeric: Optional[bool] = None) -> list:
+        """
+        All the roots of `f`.
+        @param `numeric`: whether to solve a polynomial numerically with `Polynomial.roots`,
+            by default only above degree 4, where `sympy.solve` has no closed form and gets slow.
+        @return: the roots as sympy expressions, or as complex numbers if solved numerically.
+        """
+        polynomial = self.polynomial()
+        if numeric is None:
+            numeric = polynomial is not None and polynomial.degree > 4
+        if numeric:
+            assert polynomial is not None, "only polynomials with real coefficients are solved numerically"
+            return polynomial.roots().tolist()
+        assert self.symbol_f is not None, "functions have no symbolic roots"
         return sp.solve(self.symbol_f, sympy.abc.x)
 
-    def bisection(self, a: float, b: float) -> float:
+    def bisection(
+        self,
+        a: float,
+        b: float,
+        stopping: Optional[Stopping] = None,
+        full_output: bool = False,
+        callback: Optional[Callable] = None,
+        trace: bool = False
+    ) -> Union[float, SolverResult]:
         """
         Using bisection method to find a root of funtion `f` in the interval `[a, b]`.
         Left endpoint is the anchor.
         """
-        a, b = np.asarray(a), np.asarray(b)
-        fa, fb = self.numeric_f(a), self.numeric_f(b)
+        monitor = Monitor(self.numeric_f, stopping=stopping, callback=callback, trace=trace)
+        a, b = self._scalar(a), self._scalar(b)
+        fa, fb = monitor.f(a), monitor.f(b)
+        if monitor.small(fa) or monitor.small(fb):
+            return monitor.result(a if monitor.small(fa) else b, True, full_output)
         assert fa * fb < 0, "[{}, {}] is not a proper interval".format(a, b)
-        tolerance = 2.0 * self.epsilon * max(1, abs(a))
 
-        while abs(b - a) > tolerance:
+        while not monitor.close(a, b):
+            if monitor.exhausted():
+                return monitor.result((a + b) / 2, False, full_output)
             c = (a + b) / 2.0
-            fc = self.numeric_f(c)
-            if fc == 0.0:
-                return c
+            fc = monitor.f(c)
+            monitor.iterate(c, fc)
+            if monitor.small(fc):
+                return monitor.result(c, True, full_output)
             if fa * fc < 0:
                 b = c
             else:
                 a, fa = c, fc
-        return (a + b) / 2
+        return monitor.result((a + b) / 2, True, full_output)
 
-    def fixedPointIteration(self, a: float) -> float:
-        """Using fixed point iteration to find the root of `f`."""
-        a = np.asarray(a)
-        b = self.numeric_f(a)
-        tolerance = 2.0 * self.epsilon * max(1.0, abs(a))
+    def fixedPointIteration(
+        self,
+        a: float,
+        acceleration: Optional[str] = None,
+        depth: int = 5,
+        stopping: Optional[Stopping] = None,
+        full_output: bool = False,
+        callback: Optional[Callable] = None,
+        trace: bool = False
+    ) -> Union[float, SolverResult]:
+        """
+        Using fixed point iteration to find the root of `f`.
+        The residual reported to the monitor is `f(x) - x`.
+        @param `acceleration`: `None` for the plain iteration, or
+            `aitken` for Aitken's delta-squared extrapolation of the plain iterates,
+            `steffensen` for restarting the iteration from every extrapolation,
+            `anderson` for Anderson mixing of the last `depth` iterates, see `andersonMixing`.
+        @param `depth`: the history kept by `anderson`.
+        """
+        assert acceleration in (None, "aitken", "steffensen", "anderson"), "Unknown acceleration {}.".format(acceleration)
+        if acceleration == "anderson":
+            result = andersonMixing(self.vector_f, np.atleast_1d(a), depth, stopping, True, callback, trace)
+            root = self._scalar(result.root[0])
+            return result._replace(root=root) if full_output else root
 
-        for _ in range(1000):
-            if abs(b - a) > tolerance:
-                a, b = b, self.numeric_f(b)
-            else:
-                break
+        monitor = Monitor(self.numeric_f, stopping=stopping, callback=callback, trace=trace)
+        a = self._scalar(a)
+        if acceleration == "aitken":
+            x0, x1 = a, monitor.f(a)
+            x2 = monitor.f(x1)
+            b = _aitken(x0, x1, x2)
+            monitor.iterate(b, x2 - x1)
+            while not (monitor.close(x1, x2) or monitor.small(x2 - x1)):
+                if monitor.exhausted():
+                    return monitor.result(b, False, full_output)
+                x0, x1, x2 = x1, x2, monitor.f(x2)
+                a, b = b, _aitken(x0, x1, x2)
+                monitor.iterate(b, x2 - x1)
+                if monitor.close(a, b):
+                    break
+            return monitor.result(b, True, full_output)
+
+        if acceleration == "steffensen":
+            while True:
+                x1 = monitor.f(a)
+                monitor.iterate(a, x1 - a)
+                if monitor.small(x1 - a):
+                    return monitor.result(a, True, full_output)
+                if monitor.exhausted():
+                    return monitor.result(a, False, full_output)
+                a, b = _aitken(a, x1, monitor.f(x1)), a
+                if monitor.close(b, a):
+                    return monitor.result(a, True, full_output)
+
+        b = monitor.f(a)
+        monitor.iterate(a, b - a)
 
-        return b
+        while not (monitor.close(a, b) or monitor.small(b - a)):
+            if monitor.exhausted():
+                return monitor.result(b, False, full_output)
+            a, b = b, monitor.f(b)
+            monitor.iterate(a, b - a)
 
-    def newton(self, a: float) -> float:
-        """Using Newton-Raffson's method to find the root of `f`."""
-        a, b = np.asarray(a), np.asarray(a)
-        tolerance = 2.0 * self.epsilon * max(1.0, abs(a))
-        df = sp.lambdify(sympy.abc.x, sp.diff(self.symbol_f), "numpy")
+        return monitor.result(b, True, full_output)
 
-        a, b = b, b - self.numeric_f(b) / df(b)
-        while abs(b - a) > tolerance:
-            a, b = b, b - self.numeric_f(b) / df(b)
-        return a
+    def newton(
+        self,
+        a: float,
+        derivative: Optional[str] = None,
+        stopping: Optional[Stopping] = None,
+        full_output: bool = False,
+        callback: Optional[Callable] = None,
+        trace: bool = False
+    ) -> Union[float, SolverResult]:
+        """
+        Using Newton-Raffson's method to find the root of `f`.
+        Polynomials are evaluated together with their derivatives in one Horner pass.
+        @param `derivative`: `symbolic` to compile `f'` from the expression, `automatic` to get `f` and `f'`
+            from one evaluation of `f` on dual numbers. Expressions default to `symbolic` and functions to `automatic`.
+        """
+        if derivative is None:
+            derivative = "symbolic" if self.symbol_f is not None else "automatic"
+        assert derivative in ("symbolic", "automatic"), "Unknown derivative {}.".format(derivative)
+        assert derivative == "automatic" or self.symbol_f is not None, "functions are only differentiated automatically"
+        b = self._scalar(a)
+        polynomial = self.polynomial() if self.backend == "numpy" and derivative == "symbolic" else None
+        if polynomial is not None:
+            monitor = Monitor(None, stopping=stopping, callback=callback, trace=trace)
+            def evaluate(x):
+                monitor.count(1, 1)
+                return polynomial.derivatives(x)
+        elif derivative == "automatic":
+            monitor = Monitor(None, stopping=stopping, callback=callback, trace=trace)
+            f = self.vector_f
+            def evaluate(x):
+                monitor.count(1, 1)
+                fx, dfx = dualDerivative(f, x)
+                return (fx, dfx) if self.backend == "numpy" else (float(fx), float(dfx))
+        else:
+            df = compileFunction([sympy.abc.x, *self.parameters], self.symbol_f, self.backend, derivative=1)
+            df = df if self.backend == "numpy" else _ieee(df)
+            monitor = Monitor(self.numeric_f, df, stopping=stopping, callback=callback, trace=trace)
+            evaluate = lambda x: (monitor.f(x), monitor.df(x))
+
+        fb, dfb = evaluate(b)
+        monitor.iterate(b, fb)
+        if monitor.small(fb):
+            return monitor.result(b, True, full_output)
+        a, b = b, b - _divide(fb, dfb)
+        while not monitor.close(a, b):
+            if monitor.exhausted():
+                return monitor.result(b, False, full_output)
+            fb, dfb = evaluate(b)
+            monitor.iterate(b, fb)
+            if monitor.small(fb):
+                return monitor.result(b, True, full_output)
+            a, b = b, b - _divide(fb, dfb)
+        return monitor.result(a, True, full_output)
 
-    def secant(self, a: float, b: float) -> float:
+    def secant(
+        self,
+        a: float,
+        b: float,
+        stopping: Optional[Stopping] = None,
+        full_output: bool = False,
+        callback: Optional[Callable] = None,
+        trace: bool = False
+    ) -> Union[float, SolverResult]:
         """Secant method (an improvement of Newton's method) for finding a root near `a` and `b`."""
-        a, b = np.asarray(a), np.asarray(b)
-        fa, fb = self.numeric_f(a), self.numeric_f(b)
-        tolerance = 2.0 * self.epsilon * max(1.0, abs(a))
+        monitor = Monitor(self.numeric_f, stopping=stopping, callback=callback, trace=trace)
+        a, b = self._scalar(a), self._scalar(b)
+        fa, fb = monitor.f(a), monitor.f(b)
 
-        while abs(b - a) > tolerance:
-            c = b - (fb * (b - a)) / (fb - fa)
+        while not (monitor.close(a, b) or monitor.small(fb)):
+            if monitor.exhausted():
+                return monitor.result(b, False, full_output)
+            c = b - _divide(fb * (b - a), fb - fa)
             a, b = b, c
-            fa, fb = fb, self.numeric_f(c)
-        return b
+            fa, fb = fb, monitor.f(c)
+            monitor.iterate(b, fb)
+        return monitor.result(b, True, full_output)
 
-    def regulaFalsi(self, a: float, b: float) -> float:
+    def regulaFalsi(
+        self,
+        a: float,
+        b: float,
+        stopping: Optional[Stopping] = None,
+        full_output: bool = False,
+        callback: Optional[Callable] = None,
+        trace: bool = False
+    ) -> Union[float, SolverResult]:
         """A combination of bisection and secant method."""
-        a, b = np.asarray(a), np.asarray(b)
-        fa, fb = self.numeric_f(a), self.numeric_f(b)
-        tolerance = 2.0 * self.epsilon * max(1.0, abs(a))
+        monitor = Monitor(self.numeric_f, stopping=stopping, callback=callback, trace=trace)
+        a, b = self._scalar(a), self._scalar(b)
+        fa, fb = monitor.f(a), monitor.f(b)
 
-        while abs(b - a) > tolerance:
-            c = b - (fb * (b - a)) / (fb - fa)
-            fc = self.numeric_f(c)
-            if fc == 0.0:
-                return c
+        converged = True
+        while not monitor.close(a, b):
+            if monitor.exhausted():
+                converged = False
+                break
+            c = b - _divide(fb * (b - a), fb - fa)
+            fc = monitor.f(c)
+            monitor.iterate(c, fc)
+            if monitor.small(fc):
+                return monitor.result(c, True, full_output)
             if fa * fc < 0.0:
                 b, fb = c, fc
             else:
                 a, fa = c, fc
-        return b if abs(fb) < abs(self.numeric_f((a + b) / 2.0)) else (a + b) / 2.0
+        fm = monitor.f((a + b) / 2.0)
+        return monitor.result(b if abs(fb) < abs(fm) else (a + b) / 2.0, converged, full_output)
 
-    def inverseInterpolation(self, a: float, b: float, c: float) -> float:
+    def inverseInterpolation(
+        self,
+        a: float,
+        b: float,
+        c: float,
+        stopping: Optional[Stopping] = None,
+        full_output: bool = False,
+        callback: Optional[Callable] = None,
+        trace: bool = False
+    ) -> Union[float, SolverResult]:
         """Inverse quadratic interpolation method for solving equations."""
-        a, b, c = np.asarray(a), np.asarray(b), np.asarray(c)
-        fa, fb, fc = self.numeric_f(a), self.numeric_f(b), self.numeric_f(c)
-        tolerance = 2.0 * self.epsilon * max(1.0, abs(a))
-
-        while abs(b - c) > tolerance:
-            AB = fa / fb
-            AC = fa / fc
-            BA = fb / fa
-            BC = fb / fc
-            CA = fc / fa
-            CB = fc / fb
-
-            d = -(a * (BA - CA) + b * (CB - AB) + c * (AC - BC)) / ((AB - 1) * (BC - 1) * (CA - 1))
+        monitor = Monitor(self.numeric_f, stopping=stopping, callback=callback, trace=trace)
+        a, b, c = self._scalar(a), self._scalar(b), self._scalar(c)
+        fa, fb, fc = monitor.f(a), monitor.f(b), monitor.f(c)
+
+        while not (monitor.close(b, c) or monitor.small(fc)):
+            if monitor.exhausted():
+                return monitor.result(c, False, full_output)
+            AB = _divide(fa, fb)
+            AC = _divide(fa, fc)
+            BA = _divide(fb, fa)
+            BC = _divide(fb, fc)
+            CA = _divide(fc, fa)
+            CB = _divide(fc, fb)
+
+            d = -_divide(a * (BA - CA) + b * (CB - AB) + c * (AC - BC), (AB - 1) * (BC - 1) * (CA - 1))
             a, b, c = b, c, d
-            fa, fb, fc = fb, fc, self.numeric_f(d)
+            fa, fb, fc = fb, fc, monitor.f(d)
+            monitor.iterate(d, fc)
+
+        return monitor.result(c, True, full_output)
+
+    def brent(
+        self,
+        a: float,
+        b: float,
+        stopping: Optional[Stopping] = None,
+        full_output: bool = False,
+        callback: Optional[Callable] = None,
+        trace: bool = False
+    ) -> Union[float, SolverResult]:
+        """
+        Brent's method, inverse quadratic interpolation (or secant) steps safeguarded by bisection.
+        The root stays bracketed by `[b, c]` and the interval at least halves every few steps,
+        so it converges as surely as bisection with far fewer evaluations of `f`.
+        """
+        monitor = Monitor(self.numeric_f, stopping=stopping, callback=callback, trace=trace)
+        a, b = self._scalar(a), self._scalar(b)
+        fa, fb = monitor.f(a), monitor.f(b)
+        assert fa * fb <= 0, "[{}, {}] is not a proper interval".format(a, b)
+        # `c` is the contrapoint of `b`, `d` the last step and `e` the step before it
+        c, fc = b, fb
+        d = e = b - a
+
+        while True:
+            if fb * fc > 0.0:
+                c, fc = a, fa
+                d = e = b - a
+            if abs(fc) < abs(fb):
+                a, b, c = b, c, b
+                fa, fb, fc = fb, fc, fb
+
+            # half of the tolerance on the width of the bracket
+            tolerance = monitor.stopping.tolerance(b) / 2.0
+            m = (c - b) / 2.0
+            if abs(m) <= tolerance or monitor.small(fb):
+                return monitor.result(b, True, full_output)
+            if monitor.exhausted():
+                return monitor.result(b, False, full_output)
+
+            if abs(e) < tolerance or abs(fa) <= abs(fb):
+                d = e = m
+            else:
+                s = fb / fa
+                if a == c:
+                    # secant
+                    p, q = 2.0 * m * s, 1.0 - s
+                else:
+                    # inverse quadratic interpolation
+                    q, r = fa / fc, fb / fc
+                    p = s * (2.0 * m * q * (q - r) - (b - a) * (r - 1.0))
+                    q = (q - 1.0) * (r - 1.0) * (s - 1.0)
+                if p > 0.0:
+                    q = -q
+                else:
+                    p = -p
+                # accept the interpolation only if it falls inside the bracket and shrinks fast enough
+                if 2.0 * p < min(3.0 * m * q - abs(tolerance * q), abs(e * q)):
+                    e, d = d, p / q
+                else:
+                    d = e = m
+
+            a, fa = b, fb
+            b = b + d if abs(d) > tolerance else b + math.copysign(tolerance, m)
+            fb = monitor.f(b)
+            monitor.iterate(b, fb)
+
+    def _batch(
+        self,
+        a: Iterable,
+        b: Iterable,
+        args: tuple,
+        step: Callable,
+        bracketed: bool,
+        stopping: Stopping
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Iterate independent problems as lanes of flat arrays, only the active lanes are evaluated.
+        `step(a, b, fa, fb, tolerance, f)` advances the active lanes and returns
+        `a, b, fa, fb, estimate, f(estimate), done`.
+        """
+        a, b = np.broadcast_arrays(np.asarray(a, dtype=float), np.asarray(b, dtype=float), *args)[:2]
+        shape = a.shape
+        args = tuple(np.broadcast_to(np.asarray(arg, dtype=float), shape).ravel() for arg in args)
+        a, b = a.ravel().copy(), b.ravel().copy()
+        f = lambda x, lane_args: np.broadcast_to(self.vector_f(x, *lane_args), x.shape)
+
+        fa, fb = f(a, args), f(b, args)
+        tolerance = np.maximum(stopping.xtol, stopping.rtol * np.maximum(np.abs(a), np.abs(b)))
+        root = np.where(np.abs(fa) <= stopping.ftol, a, b)
+        iterations = np.zeros(a.shape, dtype=int)
+        converged = (np.abs(fa) <= stopping.ftol) | (np.abs(fb) <= stopping.ftol)
+        proper = fa * fb <= 0.0 if bracketed else np.ones(a.shape, dtype=bool)
+        root[~proper] = np.nan
+
+        # the state of the active lanes is kept compact, and only shrinks when some lanes finish
+        lanes = np.flatnonzero(proper & ~converged)
+        a, b, fa, fb, tolerance = a[lanes], b[lanes], fa[lanes], fb[lanes], tolerance[lanes]
+        args = tuple(arg[lanes] for arg in args)
+        # every lane evaluates `f` twice before the first iteration and once per iteration
+        max_iterations = stopping.max_iterations
+        if stopping.max_evaluations is not None:
+            max_iterations = max(0, min(max_iterations, stopping.max_evaluations - 2))
+        # the estimate of lanes which get no iteration at all
+        estimate = 0.5 * (a + b) if bracketed else b.copy()
+        for k in range(1, max_iterations + 1):
+            if lanes.size == 0:
+                break
+            a, b, fa, fb, estimate, f_estimate, done = step(a, b, fa, fb, tolerance, lambda x: f(x, args))
+            done |= np.abs(f_estimate) <= stopping.ftol
+            if done.any():
+                finished = lanes[done]
+                root[finished], iterations[finished] = estimate[done], k
+                converged[finished] = np.isfinite(estimate[done])
+                keep = ~done
+                lanes, a, b, fa, fb, tolerance = lanes[keep], a[keep], b[keep], fa[keep], fb[keep], tolerance[keep]
+                args = tuple(arg[keep] for arg in args)
+                estimate = estimate[keep]
+        # lanes out of iterations keep their last estimate
+        if lanes.size > 0:
+            root[lanes], iterations[lanes] = estimate, max_iterations
+
+        return root.reshape(shape), iterations.reshape(shape), converged.reshape(shape)
+
+    def bisectionBatch(
+        self,
+        a: Iterable,
+        b: Iterable,
+        args: tuple = (),
+        stopping: Optional[Stopping] = None
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Bisection method on arrays of intervals `[a, b]`, every lane stops on its own convergence.
+        @param `a, b`: the endpoints of the intervals.
+        @param `args`: values of the `parameters` of each lane, broadcast against `a` and `b`.
+        @param `stopping`: the stopping policy of each lane, the tolerances scale with the initial values.
+        @return: the roots, the numbers of iterations and whether each lane converged.
+            Lanes whose interval does not change sign have a NaN root.
+        """
+        def step(a, b, fa, fb, tolerance, f):
+            c = (a + b) / 2.0
+            fc = f(c)
+            # the lane arrays are private copies, so they are updated in place
+            left = fa * fc < 0.0
+            np.copyto(b, c, where=left)
+            np.copyto(fb, fc, where=left)
+            np.logical_not(left, out=left)
+            np.copyto(a, c, where=left)
+            np.copyto(fa, fc, where=left)
+            return a, b, fa, fb, c, fc, np.abs(b - a) <= tolerance
+
+        return self._batch(a, b, args, step, True, stopping if stopping is not None else Stopping())
+
+    def regulaFalsiBatch(
+        self,
+        a: Iterable,
+        b: Iterable,
+        args: tuple = (),
+        stopping: Optional[Stopping] = None
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Regula falsi on arrays of intervals `[a, b]`, every lane stops on its own convergence.
+        @param `a, b`: the endpoints of the intervals.
+        @param `args`: values of the `parameters` of each lane, broadcast against `a` and `b`.
+        @param `stopping`: the stopping policy of each lane, the tolerances scale with the initial values.
+        @return: the roots, the numbers of iterations and whether each lane converged.
+            Lanes whose interval does not change sign have a NaN root.
+        """
+        def step(a, b, fa, fb, tolerance, f):
+            c = b - (fb * (b - a)) / (fb - fa)
+            fc = f(c)
+            left = fa * fc < 0.0
+            # one endpoint usually stays, so the lane also stops once the moving endpoint stalls
+            stalled = np.abs(c - np.where(left, b, a)) <= tolerance
+            np.copyto(b, c, where=left)
+            np.copyto(fb, fc, where=left)
+            np.logical_not(left, out=left)
+            np.copyto(a, c, where=left)
+            np.copyto(fa, fc, where=left)
+            return a, b, fa, fb, c, fc, stalled | (np.abs(b - a) <= tolerance)
+
+        return self._batch(a, b, args, step, True, stopping if stopping is not None else Stopping())
+
+    def secantBatch(
+        self,
+        a: Iterable,
+        b: Iterable,
+        args: tuple = (),
+        stopping: Optional[Stopping] = None
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Secant method on arrays of initial guesses `a` and `b`, every lane stops on its own convergence.
+        @param `a, b`: the initial guesses.
+        @param `args`: values of the `parameters` of each lane, broadcast against `a` and `b`.
+        @param `stopping`: the stopping policy of each lane, the tolerances scale with the initial values.
+        @return: the roots, the numbers of iterations and whether each lane converged.
+        """
+        def step(a, b, fa, fb, tolerance, f):
+            with np.errstate(divide="ignore", invalid="ignore"):
+                c = b - (fb * (b - a)) / (fb - fa)
+            fc = f(c)
+            done = (np.abs(c - b) <= tolerance) | ~np.isfinite(c)
+            return b, c, fb, fc, c, fc, done
+
+        return self._batch(a, b, args, step, False, stopping if stopping is not None else Stopping())
+
+    def scan(
+        self,
+        a: float,
+        b: float,
+        samples: int = 1000,
+        args: tuple = (),
+        depth: int = 4,
+        method: str = "bisection",
+        stopping: Optional[Stopping] = None,
+        workers: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Find all the roots of `f` in `[a, b]` where it changes sign.
+        `f` is sampled on a uniform grid, then wherever three samples keep one sign but the parabola
+        through them crosses zero, the two intervals are sampled again 8 times finer, at most `depth` times,
+        so that close pairs of roots are not stepped over. All the sign changes are then refined together.
+        Roots of even multiplicity are only found if a sample hits them.
+        @param `a, b`: the interval.
+        @param `samples`: the number of intervals of the uniform grid.
+        @param `args`: the values of the `parameters`.
+        @param `depth`: the maximum number of adaptive refinements.
+        @param `method`: the batched bracketed method refining the sign changes, `bisection` or `regulaFalsi`.
+        @param `stopping`: the stopping policy of the refinement.
+        @param `workers`: split the refinement across a pool of this many processes, worth it when `f` is expensive.
+            Functions have to be picklable, defined at the top level of a module, lambdas and closures
+            are refined in this process instead.
+        @return: the sorted roots.
+        """
+        assert a < b, "[{}, {}] is not a proper interval".format(a, b)
+        assert samples >= 2, "need at least 2 samples"
+        assert method in ("bisection", "regulaFalsi"), "Unknown method {}.".format(method)
+        f = lambda x: np.broadcast_to(self.vector_f(x, *args), x.shape)
+        x = np.linspace(a, b, samples + 1)
+        fx = f(x)
+
+        subdivisions = np.arange(1, 8) / 8.0
+        for _ in range(depth):
+            # the parabola through every three consecutive samples is `fx + s (t - x) + c (t - x)^2`
+            h1, h2 = np.diff(x)[:-1], np.diff(x)[1:]
+            d1, d2 = np.diff(fx)[:-1] / h1, np.diff(fx)[1:] / h2
+            s, c = (d1 * h2 + d2 * h1) / (h1 + h2), (d2 - d1) / (h1 + h2)
+            f0 = fx[1:-1]
+            # it bends towards zero and its vertex `f0 - s^2 / 4c` has the other sign
+            suspect = (fx[:-2] * f0 > 0.0) & (f0 * fx[2:] > 0.0) & (f0 * c > 0.0) & (4.0 * c * f0 <= s * s)
+            if not suspect.any():
+                break
+            intervals = np.unique(np.concatenate([np.flatnonzero(suspect), np.flatnonzero(suspect) + 1]))
+            new_x = (x[intervals, np.newaxis] + np.diff(x)[intervals, np.newaxis] * subdivisions).ravel()
+            x = np.concatenate([x, new_x])
+            fx = np.concatenate([fx, f(new_x)])
+            order = np.argsort(x, kind="stable")
+            x, fx = x[order], fx[order]
+
+        exact = x[fx == 0.0]
+        brackets = np.flatnonzero(fx[:-1] * fx[1:] < 0.0)
+        lo, hi = x[brackets], x[brackets + 1]
+        # the workers rebuild the solver from the expression or the function
+        function = self.symbol_f if self.symbol_f is not None else self.vector_f
+        if workers is not None and workers > 1 and lo.size > 1 and _picklable(function):
+            chunks = [chunk for chunk in np.array_split(np.arange(lo.size), workers) if chunk.size > 0]
+            with ProcessPoolExecutor(len(chunks)) as pool:
+                futures = [
+                    pool.submit(_refine, function, self.parameters, method, lo[chunk], hi[chunk], args, stopping)
+                    for chunk in chunks
+                ]
+                roots = np.concatenate([future.result() for future in futures])
+        else:
+            roots = getattr(self, method + "Batch")(lo, hi, args, stopping)[0]
 
-        return c
+        roots = np.concatenate([exact, roots])
+        return np.unique(roots[np.isfinite(roots)])
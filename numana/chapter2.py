@@ -1,38 +1,89 @@
+import math
+from typing import Callable, Iterable, Optional, Tuple, Union
+
 import numpy as np
+import sympy as sp
+
+from .cache import lambdify
+from .chapter1 import Monitor, SolverResult, Stopping
+from .dual import jacobian
+
+def forwardSubstitution(L: np.ndarray, b: np.ndarray, unit: bool = False, block_size: int = 64) -> np.ndarray:
+    """
+    Solve `Lx = b` for a lower triangular `L`, only the lower triangle of `L` is read.
+    Each block of rows first subtracts the solved rows with one matrix-matrix product,
+    then only the triangle on its diagonal is substituted row by row.
+    @param `L`: the lower triangular matrix.
+    @param `b`: the given vector, or a `n x k` matrix of right-hand sides.
+    @param `unit`: the diagonal of `L` is taken as ones.
+    @param `block_size`: the number of rows of each block.
+    @return `x`: solution to the equation Lx = b.
+    """
+    x = np.array(b, dtype=float)
+    n = L.shape[0]
+    assert x.shape[0] == n, "b must have {} rows".format(n)
+    columns = x.reshape(n, -1)
+    for k in range(0, n, block_size):
+        e = min(k + block_size, n)
+        columns[k:e] -= L[k:e, :k] @ columns[:k]
+        for i in range(k, e):
+            columns[i] -= L[i, k:i] @ columns[k:i]
+            if not unit:
+                columns[i] /= L[i, i]
+    return x
+
+def backSubstitution(U: np.ndarray, b: np.ndarray, unit: bool = False, block_size: int = 64) -> np.ndarray:
+    """
+    Solve `Ux = b` for an upper triangular `U`, only the upper triangle of `U` is read.
+    The blocks of rows go from the bottom up, as in `forwardSubstitution`.
+    @param `U`: the upper triangular matrix.
+    @param `b`: the given vector, or a `n x k` matrix of right-hand sides.
+    @param `unit`: the diagonal of `U` is taken as ones.
+    @param `block_size`: the number of rows of each block.
+    @return `x`: solution to the equation Ux = b.
+    """
+    x = np.array(b, dtype=float)
+    n = U.shape[0]
+    assert x.shape[0] == n, "b must have {} rows".format(n)
+    columns = x.reshape(n, -1)
+    for e in range(n, 0, -block_size):
+        k = max(e - block_size, 0)
+        columns[k:e] -= U[k:e, e:] @ columns[e:]
+        for i in range(e - 1, k - 1, -1):
+            columns[i] -= U[i, i + 1:e] @ columns[i + 1:e]
+            if not unit:
+                columns[i] /= U[i, i]
+    return x
 
 class GaussJordan(object):
     """Performing Gauss elimination to solve the matrix equation `Ax = b`."""
 
     def __init__(self, A: np.ndarray):
-        self.A = np.asarray(A, dtype=float)
+        """
+        Eliminate `A` once, later right-hand sides only replay the elimination on `b`.
+        @param `A`: the given matrix, it is not modified.
+        """
+        A = np.asarray(A, dtype=float)
         assert len(A.shape) == 2, "A must be a 2D matrix"
         assert A.shape[0] == A.shape[1], "A must be a 2D square matrix"
 
-        self.n = self.A.shape[0]
+        self.n = A.shape[0]
+        # the reduced upper triangular matrix, with the multipliers of each row kept below the diagonal
+        self.A = np.array(A)
+        for i in range(self.n - 1):
+            assert (np.abs(self.A[i, i]) > 1e-10), "zero pivot encountered"
+            # reduce all the rows below at once with the multiplication of top row
+            self.A[i + 1:, i] /= self.A[i, i]
+            self.A[i + 1:, i + 1:] -= np.outer(self.A[i + 1:, i], self.A[i, i + 1:])
 
     def solve(self, b: np.ndarray) -> np.ndarray:
         """
-        @param `b`: the given vector.
+        @param `b`: the given vector, or a `n x k` matrix of right-hand sides.
         @return `x`: solution to the equation Ax = b.
         """
-        x = np.array(b, dtype=float)
-
-        # last row is naturally reduced 
-        for i in range(self.n - 1):
-            assert (np.abs(self.A[i, i]) > 1e-10), "zero pivot encountered"
-            # reduce one row with the multiplication of top row
-            for j in range(i + 1, self.n):
-                mul = self.A[j, i] / self.A[i, i]
-                # need not place 0 at the left of pivot
-                self.A[j, i:] -= mul * self.A[i, i:]
-                x[j] -= mul * x[i]
-
-        # back substitution
-        x[-1] /= self.A[-1, -1]
-        for i in range(-2, -self.n - 1, -1):
-            x[i] = (x[i] - (self.A[i, i + 1: ] @ x[i + 1: ])) / self.A[i, i]
-
-        return x
+        # replay the elimination, which is the forward substitution with the unit lower triangle of multipliers
+        y = forwardSubstitution(self.A, b, unit=True)
+        return backSubstitution(self.A, y)
 
 class LU(object):
     """
@@ -69,51 +120,1014 @@ class LU(object):
         """
         Using LU decomposition to solve the matrix equation Ax = b.
         Or Ly = b, Ux = y in detail.
-        @param `b`: the given matrix and vector.
+        @param `b`: the given vector, or a `n x k` matrix of right-hand sides.
         @return `x`: solution to the equation Ax = b.
         """
-        x = np.zeros_like(b, dtype=float)
-        # forward substitution of L
-        x[0] = b[0]
-        for i in range(1, self.n):
-            x[i] = b[i] - (self.L[i, :i] @ x[:i])
+        y = forwardSubstitution(self.L, b, unit=True)
+        return backSubstitution(self.U, y)
 
-        # back substitution of U
-        x[-1] /= self.U[-1, -1]
-        for i in range(-2, -self.n - 1, -1):
-            x[i] = (x[i] - (self.U[i, i + 1: ] @ x[i + 1: ])) / self.U[i, i]
 
-        return x
+class PLU(object):
+    """
+    Decompose the given matrix with partial pivoting into `PA = LU`, where `P` permutes the rows.
+    The factorization is right-looking and blocked: each panel of `block_size` columns is factored on its own,
+    then the trailing matrix is updated by one matrix-matrix product, where most of the work happens.
+    """
+    def __init__(self, A: np.ndarray, block_size: int = 64):
+        """
+        @param `A`: the given matrix, it is not modified.
+        @param `block_size`: the number of columns of each panel.
+        """
+        A = np.asarray(A, dtype=float)
+        assert len(A.shape) == 2, "A must be a 2D matrix"
+        assert A.shape[0] == A.shape[1], "A must be a 2D square matrix"
+        assert block_size > 0, "block_size must be positive"
+
+        self.n = n = A.shape[0]
+        self.block_size = block_size
+        # `L` below the diagonal without its unit diagonal, `U` on and above it
+        self.LU = LU = np.array(A)
+        # row `i` of `PA` is row `perm[i]` of `A`
+        self.perm = np.arange(n)
+        self.sign = 1.0
+
+        for k in range(0, n, block_size):
+            e = min(k + block_size, n)
+            # factor the panel `LU[k:, k:e]`
+            for j in range(k, e):
+                p = j + np.argmax(np.abs(LU[j:, j]))
+                assert LU[p, j] != 0.0, "A is singular"
+                if p != j:
+                    LU[[j, p]] = LU[[p, j]]
+                    self.perm[[j, p]] = self.perm[[p, j]]
+                    self.sign = -self.sign
+                LU[j + 1:, j] /= LU[j, j]
+                LU[j + 1:, j + 1:e] -= np.outer(LU[j + 1:, j], LU[j, j + 1:e])
+            if e == n:
+                break
+            # the block row of `U`, by forward substitution with the unit lower triangle of the panel
+            for i in range(k + 1, e):
+                LU[i, e:] -= LU[i, k:i] @ LU[k:i, e:]
+            # the trailing matrix
+            LU[e:, e:] -= LU[e:, k:e] @ LU[k:e, e:]
+
+    @property
+    def L(self) -> np.ndarray:
+        return np.tril(self.LU, -1) + np.eye(self.n)
+
+    @property
+    def U(self) -> np.ndarray:
+        return np.triu(self.LU)
+
+    @property
+    def P(self) -> np.ndarray:
+        return np.eye(self.n)[self.perm]
+
+    def det(self) -> float:
+        """@return: the determinant of `A`, the signed product of the pivots."""
+        return self.sign * np.prod(np.diag(self.LU))
+
+    def logdet(self) -> Tuple[float, float]:
+        """@return: the sign and the logarithm of the absolute value of the determinant of `A`, which do not overflow."""
+        pivots = np.diag(self.LU)
+        return self.sign * np.prod(np.sign(pivots)), np.sum(np.log(np.abs(pivots)))
+
+    def solve(self, b: np.ndarray) -> np.ndarray:
+        """
+        Using PA = LU to solve the matrix equation Ax = b, that is Ly = Pb, Ux = y.
+        @param `b`: the given vector, or a `n x k` matrix of right-hand sides.
+        @return `x`: solution to the equation Ax = b.
+        """
+        b = np.asarray(b, dtype=float)
+        assert b.shape[0] == self.n, "b must have {} rows".format(self.n)
+        y = forwardSubstitution(self.LU, b[self.perm], unit=True, block_size=self.block_size)
+        return backSubstitution(self.LU, y, block_size=self.block_size)
 
 
 class Cholesky(object):
     """
     Decompsite the given symmetric matrix into the multiplication of a lower triangular matrix and its transpose,
     that is `A = RR^T`.
+    Only the lower triangle of `A` is read. The factorization is right-looking and blocked like `PLU`,
+    and the trailing updates only compute the lower triangle.
     """
-    def __init__(self, A: np.ndarray):
+    def __init__(self, A: np.ndarray, block_size: int = 64, overwrite_a: bool = False, check_symmetry: bool = False):
         """
         @param A: the given matrix.
+        @param `block_size`: the number of columns of each panel.
+        @param `overwrite_a`: factor a float array `A` in place, `R` is then `A` itself.
+        @param `check_symmetry`: check that `A` is symmetric up to rounding, at the cost of a transpose.
         @return: the lower triangular matrices.
         """
+        if overwrite_a and isinstance(A, np.ndarray) and A.dtype == float:
+            R = A
+        else:
+            R = np.array(A, dtype=float)
+        assert len(R.shape) == 2, "A must be a 2D matrix"
+        assert R.shape[0] == R.shape[1], "A must be a 2D square matrix"
+        assert block_size > 0, "block_size must be positive"
+        if check_symmetry:
+            assert np.allclose(R, R.T), "A must be a symmetric matrix"
+        n = R.shape[0]
+        self.n = n
+        self.block_size = block_size
+
+        for k in range(0, n, block_size):
+            e = min(k + block_size, n)
+            # the diagonal block, a failing pivot stops before the rest of the work
+            for j in range(k, e):
+                d = R[j, j] - R[j, k:j] @ R[j, k:j]
+                assert d > 0.0, "A must be a positive definite matrix"
+                R[j, j] = np.sqrt(d)
+                R[j + 1:e, j] = (R[j + 1:e, j] - R[j + 1:e, k:j] @ R[j, k:j]) / R[j, j]
+                R[j, j + 1:] = 0.0
+            if e == n:
+                break
+            # the panel below it, from R_21 R_11^T = A_21
+            R[e:, k:e] = forwardSubstitution(R[k:e, k:e], R[e:, k:e].T).T
+            # the lower triangle of the trailing matrix, one block column at a time
+            for j in range(e, n, block_size):
+                f = min(j + block_size, n)
+                R[j:, j:f] -= R[j:, k:e] @ R[j:f, k:e].T
+
+        self.R = R
+
+    def solve(self, b: np.ndarray) -> np.ndarray:
+        """
+        Using Cholesky decomposition to solve the matrix equation Ax = b.
+        Or Ry = b, R^Tx = y in detail.
+        @param `b`: the given vector, or a `n x k` matrix of right-hand sides.
+        @return `x`: solution to the equation Ax = b.
+        """
+        y = forwardSubstitution(self.R, b, block_size=self.block_size)
+        return backSubstitution(self.R.T, y, block_size=self.block_size)
+
+
+def _batch(A: np.ndarray) -> np.ndarray:
+    """A `(B, n, n)` stack as a `(n, n, B)` float array, so that every step works on contiguous batches."""
+    A = np.asarray(A, dtype=float)
+    assert len(A.shape) == 3, "A must be a (B, n, n) stack of matrices"
+    assert A.shape[1] == A.shape[2], "A must be a stack of square matrices"
+    return np.ascontiguousarray(np.moveaxis(A, 0, -1))
+
+def _eliminateBatch(A: np.ndarray, pivoting: bool, tol: float) -> Tuple[np.ndarray, Optional[np.ndarray], np.ndarray]:
+    """
+    Gauss elimination of the `(n, n, B)` stack `A` in place, with the multipliers kept below the diagonal.
+    A pivot within `tol` marks its matrix as failed and is replaced by one, so the other matrices carry on.
+    @return: `A`, the row permutations of shape `(n, B)` or `None` without pivoting, and the failure flags.
+    """
+    n, B = A.shape[0], A.shape[2]
+    failed = np.zeros(B, dtype=bool)
+    perm = np.repeat(np.arange(n)[:, np.newaxis], B, axis=1) if pivoting else None
+    batch = np.arange(B)
+    for i in range(n):
+        if pivoting and i < n - 1:
+            p = np.argmax(np.abs(A[i:, i]), axis=0) + i
+            row_i, row_p = A[i].copy(), A[p, :, batch]
+            A[p, :, batch], A[i] = row_i.T, row_p.T
+            perm[p, batch], perm[i] = perm[i], perm[p, batch]
+        small = np.abs(A[i, i]) <= tol
+        failed |= small
+        A[i, i, small] = 1.0
+        # reduce all the rows below at once with the multiplication of top row
+        A[i + 1:, i] /= A[i, i]
+        A[i + 1:, i + 1:] -= A[i + 1:, i, np.newaxis] * A[i, i + 1:]
+    return A, perm, failed
+
+def _solveBatch(
+    L: np.ndarray,
+    U: np.ndarray,
+    b: np.ndarray,
+    unit: bool,
+    perm: Optional[np.ndarray],
+    failed: np.ndarray
+) -> np.ndarray:
+    """
+    Solve `LUx = Pb` for the `(n, n, B)` stacks of triangular matrices `L` and `U`.
+    @param `b`: the `(B, n)` vectors or the `(B, n, k)` right-hand sides.
+    @return `x`: the solutions in the shape of `b`, not a number for the failed matrices.
+    """
+    n, B = L.shape[0], L.shape[2]
+    b = np.asarray(b, dtype=float)
+    assert b.shape[:2] == (B, n) and b.ndim in (2, 3), "b must be of shape (B, n) or (B, n, k)"
+    # right-hand sides as `(n, k, B)`
+    y = np.ascontiguousarray(np.moveaxis(b.reshape(B, n, -1), 0, -1))
+    if perm is not None:
+        y = np.take_along_axis(y, perm[:, np.newaxis], axis=0)
+    for i in range(n):
+        y[i] -= (L[i, :i, np.newaxis] * y[:i]).sum(axis=0)
+        if not unit:
+            y[i] /= L[i, i]
+    for i in range(n - 1, -1, -1):
+        y[i] -= (U[i, i + 1:, np.newaxis] * y[i + 1:]).sum(axis=0)
+        y[i] /= U[i, i]
+    y[..., failed] = np.nan
+    return np.moveaxis(y, -1, 0).reshape(b.shape)
+
+
+class GaussJordanBatch(object):
+    """
+    `GaussJordan` on a stack of small matrices, where each step eliminates the same column of every matrix at once.
+    Matrices with a zero pivot are flagged in `failed` instead of stopping the whole batch.
+    """
+    def __init__(self, A: np.ndarray, tol: float = 1e-10):
+        """
+        @param `A`: the `(B, n, n)` stack of matrices, it is not modified.
+        @param `tol`: pivots within it count as zero.
+        """
+        self.A, _, self.failed = _eliminateBatch(_batch(A), False, tol)
+        self.n, self.batch = self.A.shape[0], self.A.shape[2]
+
+    def solve(self, b: np.ndarray) -> np.ndarray:
+        """
+        @param `b`: the `(B, n)` vectors or the `(B, n, k)` right-hand sides.
+        @return `x`: solutions to the equations Ax = b, not a number for the failed matrices.
+        """
+        return _solveBatch(self.A, self.A, b, True, None, self.failed)
+
+
+class LUBatch(object):
+    """
+    Decompose a stack of small matrices into `PA = LU`, running the elimination across the batch.
+    Matrices with a zero pivot, that is singular ones with pivoting, are flagged in `failed`.
+    """
+    def __init__(self, A: np.ndarray, pivoting: bool = True, tol: float = 1e-10):
+        """
+        @param `A`: the `(B, n, n)` stack of matrices, it is not modified.
+        @param `pivoting`: pick the largest pivot of each column, otherwise `P` is the identity as in `LU`.
+        @param `tol`: pivots within it count as zero.
+        """
+        self.LU, self.perm, self.failed = _eliminateBatch(_batch(A), pivoting, tol)
+        self.n, self.batch = self.LU.shape[0], self.LU.shape[2]
+        if self.perm is None:
+            self.perm = np.repeat(np.arange(self.n)[:, np.newaxis], self.batch, axis=1)
+
+    @property
+    def L(self) -> np.ndarray:
+        """The `(B, n, n)` unit lower triangular matrices."""
+        return np.tril(np.moveaxis(self.LU, -1, 0), -1) + np.eye(self.n)
+
+    @property
+    def U(self) -> np.ndarray:
+        """The `(B, n, n)` upper triangular matrices."""
+        return np.triu(np.moveaxis(self.LU, -1, 0))
+
+    @property
+    def P(self) -> np.ndarray:
+        """The `(B, n, n)` permutation matrices."""
+        return np.eye(self.n)[self.perm.T]
+
+    def solve(self, b: np.ndarray) -> np.ndarray:
+        """
+        @param `b`: the `(B, n)` vectors or the `(B, n, k)` right-hand sides.
+        @return `x`: solutions to the equations Ax = b, not a number for the failed matrices.
+        """
+        return _solveBatch(self.LU, self.LU, b, True, self.perm, self.failed)
+
+
+class CholeskyBatch(object):
+    """
+    Decompose a stack of small symmetric matrices into `A = RR^T`, running the factorization across the batch.
+    Only the lower triangles are read. Matrices which are not positive definite are flagged in `failed`.
+    """
+    def __init__(self, A: np.ndarray):
+        """
+        @param `A`: the `(B, n, n)` stack of matrices, it is not modified.
+        """
+        A = _batch(A)
+        self.n, self.batch = A.shape[0], A.shape[2]
+        self.failed = np.zeros(self.batch, dtype=bool)
+        R = np.zeros_like(A)
+        for j in range(self.n):
+            d = A[j, j] - (R[j, :j] * R[j, :j]).sum(axis=0)
+            bad = d <= 0.0
+            self.failed |= bad
+            d[bad] = 1.0
+            R[j, j] = np.sqrt(d)
+            R[j + 1:, j] = (A[j + 1:, j] - (R[j + 1:, :j] * R[j, :j]).sum(axis=1)) / R[j, j]
+        self._R = R
+
+    @property
+    def R(self) -> np.ndarray:
+        """The `(B, n, n)` lower triangular matrices."""
+        return np.moveaxis(self._R, -1, 0)
+
+    def solve(self, b: np.ndarray) -> np.ndarray:
+        """
+        Using the Cholesky decompositions to solve the matrix equations Ax = b.
+        Or Ry = b, R^Tx = y in detail.
+        @param `b`: the `(B, n)` vectors or the `(B, n, k)` right-hand sides.
+        @return `x`: solutions to the equations Ax = b, not a number for the failed matrices.
+        """
+        return _solveBatch(self._R, self._R.transpose(1, 0, 2), b, False, None, self.failed)
+
+
+class Tridiagonal(object):
+    """
+    Thomas algorithm for tridiagonal matrix equations, that is LU decomposition without pivoting on the three diagonals.
+    Leading axes of the diagonals hold independent systems, which are all factored and solved together.
+    """
+    def __init__(self, lower: np.ndarray, diagonal: np.ndarray, upper: np.ndarray):
+        """
+        @param `lower`: the subdiagonal `A[i + 1, i]`, of shape `(..., n - 1)`.
+        @param `diagonal`: the diagonal `A[i, i]`, of shape `(..., n)`.
+        @param `upper`: the superdiagonal `A[i, i + 1]`, of shape `(..., n - 1)`.
+        """
+        diagonal = np.asarray(diagonal, dtype=float)
+        lower, upper = np.asarray(lower, dtype=float), np.asarray(upper, dtype=float)
+        self.n = diagonal.shape[-1]
+        assert lower.shape[-1] == upper.shape[-1] == self.n - 1, "the off diagonals must have n - 1 elements"
+        shape = np.broadcast_shapes(lower.shape[:-1], diagonal.shape[:-1], upper.shape[:-1])
+
+        # the diagonals run along the first axis, so that every step works on contiguous batches
+        self.upper = np.ascontiguousarray(np.moveaxis(np.broadcast_to(upper, shape + (self.n - 1,)), -1, 0))
+        lower = np.moveaxis(np.broadcast_to(lower, shape + (self.n - 1,)), -1, 0)
+        self.pivots = np.array(np.moveaxis(np.broadcast_to(diagonal, shape + (self.n,)), -1, 0))
+        self.multipliers = np.empty_like(self.upper)
+        if shape == ():
+            # a single system runs faster on native floats
+            pivots, multipliers, upper = self.pivots.tolist(), lower.tolist(), self.upper.tolist()
+            for i in range(1, self.n):
+                assert pivots[i - 1] != 0.0, "zero pivot encountered"
+                multipliers[i - 1] /= pivots[i - 1]
+                pivots[i] -= multipliers[i - 1] * upper[i - 1]
+            self.pivots[:], self.multipliers[:] = pivots, multipliers
+        else:
+            for i in range(1, self.n):
+                assert np.all(self.pivots[i - 1] != 0.0), "zero pivot encountered"
+                self.multipliers[i - 1] = lower[i - 1] / self.pivots[i - 1]
+                self.pivots[i] -= self.multipliers[i - 1] * self.upper[i - 1]
+        assert np.all(self.pivots[-1] != 0.0), "zero pivot encountered"
+
+    def solve(self, d: np.ndarray) -> np.ndarray:
+        """
+        @param `d`: the right-hand sides, of shape `(..., n)` broadcasting against the systems.
+        @return `x`: solution to the equations Ax = d.
+        """
+        d = np.asarray(d, dtype=float)
+        assert d.shape[-1] == self.n, "d must have {} elements".format(self.n)
+        shape = np.broadcast_shapes(d.shape[:-1], self.pivots.shape[1:])
+        x = np.array(np.moveaxis(np.broadcast_to(d, shape + (self.n,)), -1, 0))
+        if shape == ():
+            x, pivots, multipliers, upper = x.tolist(), self.pivots.tolist(), self.multipliers.tolist(), self.upper.tolist()
+        else:
+            pivots, multipliers, upper = self.pivots, self.multipliers, self.upper
+
+        # forward substitution of L
+        for i in range(1, self.n):
+            x[i] -= multipliers[i - 1] * x[i - 1]
+        # back substitution of U
+        x[-1] /= pivots[-1]
+        for i in range(self.n - 2, -1, -1):
+            x[i] = (x[i] - upper[i] * x[i + 1]) / pivots[i]
+
+        return np.array(x) if shape == () else np.moveaxis(x, 0, -1)
+
+
+class BandedLU(object):
+    """
+    LU decomposition without pivoting of a banded matrix, in the diagonal ordered storage `ab[u + i - j, j] = A[i, j]`.
+    `L` and `U` stay within the band, costing `O(n l u)` time and `O(n (l + u))` memory.
+    """
+    def __init__(self, ab: np.ndarray, l: int, u: int):
+        """
+        @param `ab`: the band of `A`, of shape `(l + u + 1, n)`, it is not modified.
+        @param `l, u`: the number of subdiagonals and superdiagonals.
+        """
+        self.ab = np.array(ab, dtype=float)
+        assert self.ab.ndim == 2 and self.ab.shape[0] == l + u + 1, "ab must have l + u + 1 rows"
+        self.n = self.ab.shape[1]
+        self.l, self.u = l, u
+
+        # rows below and columns right of the pivot, the multipliers of `L` are stored below the diagonal
+        rows, columns = np.arange(1, l + 1), np.arange(1, u + 1)
+        for j in range(self.n):
+            pivot = self.ab[u, j]
+            assert pivot != 0.0, "zero pivot encountered"
+            ml, mu = min(l, self.n - 1 - j), min(u, self.n - 1 - j)
+            self.ab[u + 1:u + 1 + ml, j] /= pivot
+            if ml > 0 and mu > 0:
+                r, c = rows[:ml, np.newaxis], columns[np.newaxis, :mu]
+                # A[j + r, j + c] -= L[j + r, j] U[j, j + c]
+                self.ab[u + r - c, j + c] -= np.outer(self.ab[u + 1:u + 1 + ml, j], self.ab[u - columns[:mu], j + columns[:mu]])
+
+    def solve(self, b: np.ndarray) -> np.ndarray:
+        """
+        @param `b`: the given vector, or a `n x k` matrix of right-hand sides.
+        @return `x`: solution to the equation Ax = b.
+        """
+        x = np.array(b, dtype=float)
+        assert x.shape[0] == self.n, "b must have {} rows".format(self.n)
+        columns = x.reshape(self.n, -1)
+        l, u = self.l, self.u
+
+        # forward substitution of L, column by column
+        for j in range(self.n - 1):
+            ml = min(l, self.n - 1 - j)
+            columns[j + 1:j + 1 + ml] -= np.outer(self.ab[u + 1:u + 1 + ml, j], columns[j])
+        # back substitution of U, column by column
+        for j in range(self.n - 1, -1, -1):
+            columns[j] /= self.ab[u, j]
+            mu = min(u, j)
+            columns[j - mu:j] -= np.outer(self.ab[u - mu:u, j], columns[j])
+
+        return x
+
+
+class BandedCholesky(object):
+    """
+    Cholesky decomposition `A = RR^T` of a symmetric positive definite banded matrix,
+    in the lower diagonal ordered storage `ab[i - j, j] = A[i, j]` for `i >= j`.
+    """
+    def __init__(self, ab: np.ndarray):
+        """
+        @param `ab`: the lower band of `A`, of shape `(l + 1, n)`, it is not modified.
+        """
+        self.R = np.array(ab, dtype=float)
+        assert self.R.ndim == 2, "ab must be a 2D array"
+        self.l = l = self.R.shape[0] - 1
+        self.n = self.R.shape[1]
+
+        # the pairs `p >= q` of rows below the pivot, A[j + 1 + p, j + 1 + q] sits at ab[p - q, j + 1 + q]
+        p, q = np.tril_indices(l)
+        for j in range(self.n):
+            assert self.R[0, j] > 0.0, "A must be a positive definite matrix"
+            self.R[0, j] = np.sqrt(self.R[0, j])
+            m = min(l, self.n - 1 - j)
+            column = self.R[1:m + 1, j]
+            column /= self.R[0, j]
+            if m < l:
+                inside = p < m
+                p, q = p[inside], q[inside]
+            self.R[p - q, j + 1 + q] -= column[p] * column[q]
+
+    def solve(self, b: np.ndarray) -> np.ndarray:
+        """
+        Using the banded Cholesky decomposition to solve the matrix equation Ax = b.
+        Or Ry = b, R^Tx = y in detail.
+        @param `b`: the given vector, or a `n x k` matrix of right-hand sides.
+        @return `x`: solution to the equation Ax = b.
+        """
+        x = np.array(b, dtype=float)
+        assert x.shape[0] == self.n, "b must have {} rows".format(self.n)
+        columns = x.reshape(self.n, -1)
+        l = self.l
+
+        # forward substitution of R, column by column
+        for j in range(self.n):
+            columns[j] /= self.R[0, j]
+            m = min(l, self.n - 1 - j)
+            columns[j + 1:j + 1 + m] -= np.outer(self.R[1:m + 1, j], columns[j])
+        # back substitution of R^T, row by row
+        for j in range(self.n - 1, -1, -1):
+            m = min(l, self.n - 1 - j)
+            columns[j] = (columns[j] - self.R[1:m + 1, j] @ columns[j + 1:j + 1 + m]) / self.R[0, j]
+
+        return x
+
+
+class CSRMatrix(object):
+    """
+    A sparse matrix in compressed sparse row storage: the entries of row `i` are `data[indptr[i]:indptr[i + 1]]`,
+    in the columns `indices[indptr[i]:indptr[i + 1]]`, taking `O(nnz)` memory.
+    """
+    def __init__(self, data: np.ndarray, indices: np.ndarray, indptr: np.ndarray, shape: Tuple[int, int]):
+        """
+        @param `data`: the nonzero entries, row by row.
+        @param `indices`: the column of each entry.
+        @param `indptr`: the offset of each row in `data`, with one more element than rows.
+        @param `shape`: the shape of the matrix.
+        """
+        self.data = np.asarray(data, dtype=float)
+        self.indices = np.asarray(indices, dtype=np.intp)
+        self.indptr = np.asarray(indptr, dtype=np.intp)
+        self.shape = tuple(shape)
+        assert len(self.shape) == 2, "shape must be 2D"
+        assert self.indptr.shape == (self.shape[0] + 1,), "indptr must have one more element than rows"
+        assert self.data.shape == self.indices.shape == (self.indptr[-1],), "data and indices must have indptr[-1] elements"
+        # the row of each entry, for the matrix-vector product
+        self.rows = np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+
+    @classmethod
+    def fromDense(cls, A: np.ndarray) -> "CSRMatrix":
+        """@return: the nonzero entries of the dense matrix `A`."""
         A = np.asarray(A, dtype=float)
         assert len(A.shape) == 2, "A must be a 2D matrix"
-        assert A.shape[0] == A.shape[1], "A must be a 2D square matrix"
-        assert np.array_equal(A, A.T), "A must be a symmetric matrix"
-        n = A.shape[0]
-
-        self.R = np.zeros_like(A, dtype=A.dtype)
-        # for first row and column of R
-        self.R[0, 0] = np.sqrt(A[0, 0])
-        self.R[0, 1:] = A[0, 1:] / self.R[0, 0]
-        self.R[1:, 0] = A[1:, 0] / self.R[0, 0]
-
-        # for each row and column of R
-        for i in range(1, n - 1):
-            self.R[i, i] = np.sqrt(A[i, i] - (self.R[i, :i] @ self.R[:i, i]))
-            self.R[i, i + 1:] = (A[i, i + 1:] - (self.R[i, :i] @ self.R[:i, i + 1:])) / self.R[i, i]
-            self.R[i + 1:, i] = (A[i + 1:, i] - (self.R[i + 1:, :i] @ self.R[:i, i])) / self.R[i, i]
-
-        # for the last element of R
-        self.R[-1, -1] = np.sqrt(A[-1, -1] - (self.R[-1, :-1] @ self.R[:-1, -1]))
-        self.R = np.tril(self.R)
+        rows, columns = np.nonzero(A)
+        indptr = np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=A.shape[0]))])
+        return cls(A[rows, columns], columns, indptr, A.shape)
+
+    @classmethod
+    def fromCOO(cls, rows: np.ndarray, columns: np.ndarray, values: np.ndarray, shape: Tuple[int, int]) -> "CSRMatrix":
+        """@return: the matrix with entries `values` at `(rows, columns)`, duplicates are summed."""
+        rows, columns = np.asarray(rows, dtype=np.intp), np.asarray(columns, dtype=np.intp)
+        values = np.asarray(values, dtype=float)
+        keys, inverse = np.unique(rows * shape[1] + columns, return_inverse=True)
+        data = np.bincount(inverse.ravel(), weights=values, minlength=keys.size)
+        rows, columns = np.divmod(keys, shape[1])
+        indptr = np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=shape[0]))])
+        return cls(data, columns, indptr, shape)
+
+    @property
+    def nnz(self) -> int:
+        return self.data.size
+
+    def diagonal(self) -> np.ndarray:
+        """@return: the main diagonal, zero where no entry is stored."""
+        diagonal = np.zeros(min(self.shape))
+        on = self.rows == self.indices
+        np.add.at(diagonal, self.rows[on], self.data[on])
+        return diagonal
+
+    def transpose(self) -> "CSRMatrix":
+        """@return: the transpose, with the rows and the columns of the entries exchanged."""
+        return CSRMatrix.fromCOO(self.indices, self.rows, self.data, self.shape[::-1])
+
+    def toDense(self) -> np.ndarray:
+        A = np.zeros(self.shape)
+        np.add.at(A, (self.rows, self.indices), self.data)
+        return A
+
+    def __matmul__(self, x: np.ndarray) -> np.ndarray:
+        """
+        @param `x`: a vector, or a matrix with one column per vector.
+        @return: the product `Ax`, gathering `x` at the columns and summing the products by rows.
+        """
+        x = np.asarray(x, dtype=float)
+        assert x.shape[0] == self.shape[1], "x must have {} rows".format(self.shape[1])
+        if x.ndim == 1:
+            return np.bincount(self.rows, weights=self.data * x[self.indices], minlength=self.shape[0])
+        products = self.data[:, np.newaxis] * x[self.indices]
+        return np.stack([np.bincount(self.rows, weights=column, minlength=self.shape[0]) for column in products.T], axis=-1)
+
+
+class StationaryIteration(object):
+    """
+    Stationary iterative methods for `Ax = b` on a sparse matrix, no dense matrix is ever formed.
+    The methods stop once the max norm of a step is within `stopping`,
+    `Stopping(xtol=1e-10, rtol=1e-10, max_iterations=10000)` if not given,
+    and return the solution, or a `SolverResult` with `full_output` whose residual is the max norm of `b - Ax`.
+    """
+    def __init__(self, A: Union[CSRMatrix, np.ndarray]):
+        """
+        @param `A`: the matrix, dense matrices are converted to `CSRMatrix`.
+        """
+        self.A = A if isinstance(A, CSRMatrix) else CSRMatrix.fromDense(A)
+        assert self.A.shape[0] == self.A.shape[1], "A must be a square matrix"
+        self.n = self.A.shape[0]
+        self.D = self.A.diagonal()
+        assert np.all(self.D != 0.0), "A must have a nonzero diagonal"
+        # the rows as native lists for the sweeps of Gauss-Seidel, built on first use
+        self._rows = None
+
+    def _iterate(
+        self,
+        b: np.ndarray,
+        x: Optional[np.ndarray],
+        step: Callable,
+        stopping: Optional[Stopping],
+        full_output: bool,
+        callback: Optional[Callable],
+        trace: bool
+    ) -> Union[np.ndarray, SolverResult]:
+        """Repeat `x = step(x)` until the step is small enough."""
+        if stopping is None:
+            stopping = Stopping(xtol=1e-10, rtol=1e-10, max_iterations=10000)
+        monitor = Monitor(None, stopping=stopping, callback=callback, trace=trace)
+        b = np.asarray(b, dtype=float)
+        assert b.shape == (self.n,), "b must be a vector of {} elements".format(self.n)
+        x = np.zeros(self.n) if x is None else np.array(x, dtype=float)
+
+        converged = False
+        while not monitor.exhausted():
+            x_new = step(x, b)
+            monitor.count(1)
+            change = np.max(np.abs(x_new - x))
+            x = x_new
+            monitor.iterate(x, change)
+            if change <= stopping.tolerance(np.max(np.abs(x))):
+                converged = True
+                break
+        monitor.residual = np.max(np.abs(b - self.A @ x))
+        return monitor.result(x, converged, full_output)
+
+    def _sweep(self, x: np.ndarray, b: np.ndarray, omega: float, order: Iterable[int]) -> np.ndarray:
+        """One SOR sweep over the rows in `order`, updating `x` in place row after row."""
+        if self._rows is None:
+            A = self.A
+            self._rows = [
+                (A.indices[A.indptr[i]:A.indptr[i + 1]].tolist(), A.data[A.indptr[i]:A.indptr[i + 1]].tolist())
+                for i in range(self.n)
+            ]
+        rows, D, b = self._rows, self.D.tolist(), b.tolist()
+        x = x.tolist()
+        for i in order:
+            columns, values = rows[i]
+            # the sum includes the diagonal term, which is added back
+            sigma = sum(v * x[j] for j, v in zip(columns, values))
+            x[i] += omega * (b[i] - sigma) / D[i]
+        return np.array(x)
+
+    def jacobi(
+        self,
+        b: np.ndarray,
+        x: Optional[np.ndarray] = None,
+        stopping: Optional[Stopping] = None,
+        full_output: bool = False,
+        callback: Optional[Callable] = None,
+        trace: bool = False
+    ) -> Union[np.ndarray, SolverResult]:
+        """
+        Jacobi method `x = x + D^{-1}(b - Ax)`, every row is updated at once from one matrix-vector product.
+        @param `b`: the given vector.
+        @param `x`: the initial guess, zero if `None`.
+        """
+        return self._iterate(b, x, lambda x, b: x + (b - self.A @ x) / self.D, stopping, full_output, callback, trace)
+
+    def gaussSeidel(
+        self,
+        b: np.ndarray,
+        x: Optional[np.ndarray] = None,
+        stopping: Optional[Stopping] = None,
+        full_output: bool = False,
+        callback: Optional[Callable] = None,
+        trace: bool = False
+    ) -> Union[np.ndarray, SolverResult]:
+        """
+        Gauss-Seidel method, every row is updated in turn with the newest values of the others.
+        @param `b`: the given vector.
+        @param `x`: the initial guess, zero if `None`.
+        """
+        return self.sor(b, 1.0, x, stopping, full_output, callback, trace)
+
+    def sor(
+        self,
+        b: np.ndarray,
+        omega: float,
+        x: Optional[np.ndarray] = None,
+        stopping: Optional[Stopping] = None,
+        full_output: bool = False,
+        callback: Optional[Callable] = None,
+        trace: bool = False
+    ) -> Union[np.ndarray, SolverResult]:
+        """
+        Successive over-relaxation, Gauss-Seidel steps scaled by `omega`.
+        @param `b`: the given vector.
+        @param `omega`: the relaxation factor in `(0, 2)`.
+        @param `x`: the initial guess, zero if `None`.
+        """
+        assert 0.0 < omega < 2.0, "omega must be in (0, 2)"
+        order = range(self.n)
+        return self._iterate(b, x, lambda x, b: self._sweep(x, b, omega, order), stopping, full_output, callback, trace)
+
+    def ssor(
+        self,
+        b: np.ndarray,
+        omega: float,
+        x: Optional[np.ndarray] = None,
+        stopping: Optional[Stopping] = None,
+        full_output: bool = False,
+        callback: Optional[Callable] = None,
+        trace: bool = False
+    ) -> Union[np.ndarray, SolverResult]:
+        """
+        Symmetric successive over-relaxation, a forward SOR sweep followed by a backward one.
+        @param `b`: the given vector.
+        @param `omega`: the relaxation factor in `(0, 2)`.
+        @param `x`: the initial guess, zero if `None`.
+        """
+        assert 0.0 < omega < 2.0, "omega must be in (0, 2)"
+        forward, backward = range(self.n), range(self.n - 1, -1, -1)
+        def step(x, b):
+            return self._sweep(self._sweep(x, b, omega, forward), b, omega, backward)
+        return self._iterate(b, x, step, stopping, full_output, callback, trace)
+
+
+def incompleteCholesky(A: CSRMatrix) -> CSRMatrix:
+    """
+    Incomplete Cholesky factorization without fill-in, IC(0).
+    `R` keeps the sparsity pattern of the lower triangle of `A`, where `RR^T` matches `A`.
+    @param `A`: the symmetric positive definite matrix, only its lower triangle is read.
+    @return: the lower triangular factor `R`.
+    """
+    n = A.shape[0]
+    assert A.shape[1] == n, "A must be a square matrix"
+    # the rows of `R` as dictionaries from columns to values
+    factor = []
+    data, indices, indptr = [], [], [0]
+    for i in range(n):
+        s, e = A.indptr[i], A.indptr[i + 1]
+        row = {j: v for j, v in zip(A.indices[s:e].tolist(), A.data[s:e].tolist()) if j <= i}
+        Ri = {}
+        for k in sorted(row):
+            if k == i:
+                break
+            Rk = factor[k]
+            Ri[k] = (row[k] - sum(v * Rk[j] for j, v in Ri.items() if j in Rk)) / Rk[k]
+        d = row.get(i, 0.0) - sum(v * v for v in Ri.values())
+        assert d > 0.0, "incomplete Cholesky factorization broke down"
+        Ri[i] = math.sqrt(d)
+        factor.append(Ri)
+        indices += list(Ri)
+        data += list(Ri.values())
+        indptr.append(len(data))
+    return CSRMatrix(data, indices, indptr, A.shape)
+
+
+class _SparseTriangular(object):
+    """
+    Forward or back substitution with a triangle of a sparse matrix, scheduled by levels.
+    The rows of one level only depend on the rows of earlier levels, so each level is solved at once
+    by gathering the known unknowns and summing the products by rows.
+    """
+    def __init__(self, T: CSRMatrix, lower: bool = True):
+        """
+        @param `T`: the matrix, only its lower or upper triangle is read.
+        @param `lower`: forward substitution with the lower triangle, otherwise back substitution with the upper one.
+        """
+        n = T.shape[0]
+        assert T.shape[1] == n, "T must be a square matrix"
+        self.n = n
+        diagonal = T.diagonal()
+        assert np.all(diagonal != 0.0), "zero pivot encountered"
+        off = T.indices < T.rows if lower else T.indices > T.rows
+        rows, columns, values = T.rows[off], T.indices[off], T.data[off]
+
+        # the level of a row is one more than the deepest row it depends on
+        level = [0] * n
+        dependencies = np.split(columns, np.searchsorted(rows, np.arange(1, n)))
+        dependencies = [d.tolist() for d in dependencies]
+        for i in (range(n) if lower else range(n - 1, -1, -1)):
+            if dependencies[i]:
+                level[i] = 1 + max(level[j] for j in dependencies[i])
+        level = np.array(level)
+
+        order = np.argsort(level, kind="stable")
+        starts = np.searchsorted(level[order], np.arange(level.max() + 2))
+        # the position of each row within its level
+        local = np.empty(n, dtype=np.intp)
+        local[order] = np.arange(n) - starts[level[order]]
+        entries = np.argsort(level[rows], kind="stable")
+        entry_starts = np.searchsorted(level[rows][entries], np.arange(level.max() + 2))
+        self.levels = []
+        for k in range(level.max() + 1):
+            level_rows = order[starts[k]:starts[k + 1]]
+            e = entries[entry_starts[k]:entry_starts[k + 1]]
+            self.levels.append((level_rows, diagonal[level_rows], local[rows[e]], columns[e], values[e]))
+
+    def solve(self, b: np.ndarray) -> np.ndarray:
+        """
+        @param `b`: the given vector.
+        @return `x`: solution to the triangular equation.
+        """
+        x = np.empty(self.n)
+        for rows, diagonal, local, columns, values in self.levels:
+            y = b[rows]
+            if columns.size:
+                y = y - np.bincount(local, weights=values * x[columns], minlength=rows.size)
+            x[rows] = y / diagonal
+        return x
+
+
+class ConjugateGradient(object):
+    """
+    Preconditioned conjugate gradient method for symmetric positive definite `Ax = b`.
+    Only products with `A` are needed, so `A` may be a dense matrix, a `CSRMatrix` or a function `x -> Ax`.
+    """
+    PRECONDITIONERS = (None, "jacobi", "ssor", "ichol")
+
+    def __init__(self, A: Union[np.ndarray, CSRMatrix, Callable], preconditioner: Optional[str] = None, omega: float = 1.0):
+        """
+        @param `A`: the matrix, or the function computing the matrix-vector product.
+        @param `preconditioner`: `None`, `jacobi` for the diagonal, `ssor` for symmetric SOR with `omega`,
+            or `ichol` for the incomplete Cholesky factorization. Preconditioners need the entries of `A`.
+        @param `omega`: the relaxation factor of `ssor`, in `(0, 2)`.
+        """
+        assert preconditioner in self.PRECONDITIONERS, "Unknown preconditioner {}.".format(preconditioner)
+        if isinstance(A, (np.ndarray, CSRMatrix)):
+            assert len(A.shape) == 2 and A.shape[0] == A.shape[1], "A must be a square matrix"
+            self.matvec = A.__matmul__
+        else:
+            assert callable(A), "A must be a matrix or a function"
+            assert preconditioner is None, "preconditioners need the entries of A"
+            self.matvec = A
+        self.preconditioner = preconditioner
+
+        if preconditioner is None:
+            self.precondition = lambda r: r
+            return
+        csr = A if isinstance(A, CSRMatrix) else CSRMatrix.fromDense(A)
+        if preconditioner == "jacobi":
+            D = csr.diagonal()
+            assert np.all(D > 0.0), "A must have a positive diagonal"
+            self.precondition = lambda r: r / D
+        elif preconditioner == "ssor":
+            # M = (D + wL) D^{-1} (D + wU) / (w (2 - w)), both triangles are read from `D + w(L + U)`
+            assert 0.0 < omega < 2.0, "omega must be in (0, 2)"
+            D = csr.diagonal()
+            assert np.all(D > 0.0), "A must have a positive diagonal"
+            relaxed = CSRMatrix(np.where(csr.rows == csr.indices, 1.0, omega) * csr.data, csr.indices, csr.indptr, csr.shape)
+            lower, upper = _SparseTriangular(relaxed, lower=True), _SparseTriangular(relaxed, lower=False)
+            scale = omega * (2.0 - omega)
+            self.precondition = lambda r: upper.solve(D * lower.solve(scale * r))
+        else:
+            # RR^Tz = r, the back substitution runs on the rows of `R^T`
+            self.R = incompleteCholesky(csr)
+            lower, upper = _SparseTriangular(self.R, lower=True), _SparseTriangular(self.R.transpose(), lower=False)
+            self.precondition = lambda r: upper.solve(lower.solve(r))
+
+    def solve(
+        self,
+        b: np.ndarray,
+        x: Optional[np.ndarray] = None,
+        rtol: float = 1e-10,
+        max_iterations: Optional[int] = None,
+        full_output: bool = False,
+        callback: Optional[Callable] = None
+    ) -> Union[np.ndarray, SolverResult]:
+        """
+        @param `b`: the given vector.
+        @param `x`: the initial guess, zero if `None`.
+        @param `rtol`: stop once the relative residual `|b - Ax| / |b|` is within it.
+        @param `max_iterations`: the maximum number of iterations, `10 n` if `None`.
+        @return `x`: solution to the equation Ax = b, or a `SolverResult` with `full_output`,
+            whose evaluations count the matrix-vector products and whose trace is the history of relative residuals.
+        """
+        b = np.asarray(b, dtype=float)
+        assert b.ndim == 1, "b must be a vector"
+        n = b.size
+        monitor = Monitor(None, stopping=Stopping(max_iterations=max_iterations or 10 * n), callback=callback)
+        x = np.zeros(n) if x is None else np.array(x, dtype=float)
+        norm = np.linalg.norm(b)
+        if norm == 0.0:
+            norm = 1.0
+
+        r = b - self.matvec(x) if x.any() else b.copy()
+        history = [np.linalg.norm(r) / norm]
+        z = self.precondition(r)
+        p = z.copy()
+        rz = r @ z
+        while history[-1] > rtol and not monitor.exhausted():
+            Ap = self.matvec(p)
+            monitor.count(1)
+            pAp = p @ Ap
+            assert pAp > 0.0, "A must be a positive definite matrix"
+            alpha = rz / pAp
+            x += alpha * p
+            r -= alpha * Ap
+            history.append(np.linalg.norm(r) / norm)
+            monitor.iterate(x, history[-1])
+            z = self.precondition(r)
+            rz, rz_previous = r @ z, rz
+            p *= rz / rz_previous
+            p += z
+
+        if not full_output:
+            return x
+        return monitor.result(x, history[-1] <= rtol, True)._replace(trace=history)
+
+
+class NonlinearSystem(object):
+    """
+    Solvers for the system of equations `F(x) = 0`, the residual vector and its Jacobian are compiled once,
+    or the Jacobian comes from evaluating `F` on dual numbers.
+    The methods stop as told by a `Stopping` policy, applied to the max norms of the steps and the residuals,
+    and return the root, or a `SolverResult` with `full_output`.
+    """
+    def __init__(
+        self,
+        F: Union[Iterable[sp.Expr], Callable],
+        variables: Union[Iterable[sp.Symbol], int],
+        derivative: Optional[str] = None
+    ):
+        """
+        @param `F`: the expressions of the equations, or a numpy compatible function from vectors to vectors.
+        @param `variables`: the unknowns, as many as the equations, or their number if `F` is a function.
+        @param `derivative`: `symbolic` to compile the Jacobian of the expressions, `automatic` to evaluate `F`
+            on dual numbers instead, which skips differentiating large systems symbolically.
+            Expressions default to `symbolic` and functions to `automatic`.
+        """
+        if callable(F) and not isinstance(F, sp.Basic):
+            assert derivative in (None, "automatic"), "functions are only differentiated automatically"
+            self.n = int(variables)
+            self.variables = self.symbol_F = self.symbol_J = None
+            numeric_F = F
+            derivative = "automatic"
+        else:
+            F = list(F)
+            self.variables = tuple(variables)
+            self.n = len(self.variables)
+            assert len(F) == self.n, "need as many equations as unknowns"
+            self.symbol_F = sp.Matrix(F)
+            # a list, so that dual numbers are not packed into an array
+            numeric_F = lambdify([self.variables], F, cse=True)
+
+        if derivative is None or derivative == "symbolic":
+            self.symbol_J = self.symbol_F.jacobian(self.variables)
+            numeric_J = lambdify([self.variables], self.symbol_J, cse=True)
+            self.numeric_J = lambda x: np.asarray(numeric_J(x), dtype=float).reshape(self.n, self.n)
+        else:
+            assert derivative == "automatic", "Unknown derivative {}.".format(derivative)
+            self.symbol_J = None
+            self.numeric_J = lambda x: jacobian(numeric_F, x)[1].reshape(self.n, self.n)
+        self.numeric_F = lambda x: np.asarray(numeric_F(x), dtype=float).reshape(self.n)
+
+    @staticmethod
+    def _factor(J: np.ndarray) -> Optional[PLU]:
+        """The factorization of the Jacobian, `None` if it is singular."""
+        try:
+            return PLU(J)
+        except AssertionError:
+            return None
+
+    @staticmethod
+    def _converged(monitor: Monitor, x: np.ndarray, step: np.ndarray) -> bool:
+        """Test the step and the residual of the finite iterate just recorded."""
+        stopping = monitor.stopping
+        return monitor.residual <= stopping.ftol or np.max(np.abs(step)) <= stopping.tolerance(np.max(np.abs(x)))
+
+    def newton(
+        self,
+        x: Iterable,
+        chord: bool = False,
+        stopping: Optional[Stopping] = None,
+        full_output: bool = False,
+        callback: Optional[Callable] = None,
+        trace: bool = False
+    ) -> Union[np.ndarray, SolverResult]:
+        """
+        Multivariate Newton's method, every step solves `J(x) s = -F(x)` with the `PLU` factorization of the Jacobian.
+        A singular Jacobian stops the iteration without convergence.
+        @param `x`: the initial value.
+        @param `chord`: keep the factorization of the Jacobian across iterations,
+            it is only evaluated and factored again when the residual stops halving.
+        """
+        monitor = Monitor(self.numeric_F, self.numeric_J, stopping=stopping, callback=callback, trace=trace)
+        x = np.array(x, dtype=float)
+        Fx = monitor.f(x)
+        lu = self._factor(monitor.df(x))
+        while True:
+            if lu is None:
+                return monitor.result(x, False, full_output)
+            step = -lu.solve(Fx)
+            x = x + step
+            previous, Fx = Fx, monitor.f(x)
+            # an iterate or a residual overflowing to infinity or not a number never recovers
+            monitor.iterate(x, np.max(np.abs(Fx)))
+            if monitor.diverged:
+                return monitor.result(x, False, full_output)
+            if self._converged(monitor, x, step):
+                return monitor.result(x, True, full_output)
+            if monitor.exhausted():
+                return monitor.result(x, False, full_output)
+            if not chord or np.max(np.abs(Fx)) > 0.5 * np.max(np.abs(previous)):
+                lu = self._factor(monitor.df(x))
+
+    def broyden(
+        self,
+        x: Iterable,
+        memory: int = 20,
+        stopping: Optional[Stopping] = None,
+        full_output: bool = False,
+        callback: Optional[Callable] = None,
+        trace: bool = False
+    ) -> Union[np.ndarray, SolverResult]:
+        """
+        Broyden's method, the Jacobian is only evaluated and factored at the start, and then updated by rank one
+        secant corrections applied to its inverse with the Sherman-Morrison formula, from the stored steps.
+        A singular Jacobian stops the iteration without convergence.
+        @param `x`: the initial value.
+        @param `memory`: the number of steps stored, the Jacobian is evaluated again once they are used up.
+        """
+        assert memory > 0, "memory must be positive"
+        monitor = Monitor(self.numeric_F, self.numeric_J, stopping=stopping, callback=callback, trace=trace)
+        x = np.array(x, dtype=float)
+        Fx = monitor.f(x)
+        lu = self._factor(monitor.df(x))
+        if lu is None:
+            return monitor.result(x, False, full_output)
+        steps = [-lu.solve(Fx)]
+        while True:
+            step = steps[-1]
+            x = x + step
+            Fx = monitor.f(x)
+            # an iterate or a residual overflowing to infinity or not a number never recovers
+            monitor.iterate(x, np.max(np.abs(Fx)))
+            if monitor.diverged:
+                return monitor.result(x, False, full_output)
+            if self._converged(monitor, x, step):
+                return monitor.result(x, True, full_output)
+            if monitor.exhausted():
+                return monitor.result(x, False, full_output)
+
+            if len(steps) > memory:
+                lu = self._factor(monitor.df(x))
+                if lu is None:
+                    return monitor.result(x, False, full_output)
+                steps = [-lu.solve(Fx)]
+                continue
+            # z = -B^{-1} F(x) with the inverse of the updated Jacobian B unrolled over the stored steps
+            z = -lu.solve(Fx)
+            for s, s_next in zip(steps[:-1], steps[1:]):
+                z += s_next * (s @ z) / (s @ s)
+            steps.append(z / (1.0 - (step @ z) / (step @ step)))
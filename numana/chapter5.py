@@ -4,6 +4,9 @@ from typing import Tuple
 import numpy as np
 import sympy as sp
 
+from .cache import lambdify
+from .chapter0 import kahanSum, neumaierSum, pairwiseSum
+
 class NewtonCotes(object):
     """
     Newton-Cotes methods for numerical integration.
@@ -12,7 +15,7 @@ class NewtonCotes(object):
     def __init__(self, f: sp.Function):
         self.x = sp.Symbol('x')
         self.symbol_f = f
-        self.numeric_f = sp.lambdify(self.x, f, "numpy")
+        self.numeric_f = lambdify(self.x, f, "numpy")
 
     def __call__(self, a: float, b: float) -> Tuple[float, float, float, float, float, float, float, float]:
         """Integration on `[a, b]`."""
@@ -102,11 +105,22 @@ class CompositeNewtonCotes(object):
     """
     Composite Newton-Cotes methods for numerical integration.
     @param `f`: the function to evaluate on some intervals.
+    @param `summation`: how the samples are summed, one of `SUMMATION`.
     """
-    def __init__(self, f: sp.Function):
+
+    SUMMATION = {
+        "naive": np.sum,
+        "kahan": kahanSum,
+        "neumaier": neumaierSum,
+        "pairwise": pairwiseSum,
+    }
+
+    def __init__(self, f: sp.Function, summation: str = "naive"):
+        assert summation in self.SUMMATION, "Unknown summation {}.".format(summation)
         self.x = sp.Symbol('x')
         self.symbol_f = f
-        self.numeric_f = sp.lambdify(self.x, f, "numpy")
+        self.numeric_f = lambdify(self.x, f, "numpy")
+        self.sum = self.SUMMATION[summation]
 
     def __call__(self, a: float, b: float, m: int) -> Tuple[float, float, float, float]:
         """Divide `[a, b]` into `m` segments."""
@@ -127,7 +141,7 @@ class CompositeNewtonCotes(object):
         h = (b - a) / m
         x = np.linspace(a, b, m + 1)
         y = self.numeric_f(x)
-        return (y[0] + y[-1] + 2.0 * np.sum(y[1:-1])) * h * 0.5
+        return (y[0] + y[-1] + 2.0 * self.sum(y[1:-1])) * h * 0.5
 
     def _midpoint(self, a: float, b: float, m: int) -> float:
         """Composite Midpoint Rule."""
@@ -135,14 +149,14 @@ class CompositeNewtonCotes(object):
         h2 = h / 2.0
         x = np.linspace(a + h2, b - h2, m)
         y = self.numeric_f(x)
-        return np.sum(y) * (b - a) / m
+        return self.sum(y) * (b - a) / m
 
     def _simpson(self, a: float, b: float, m: int) -> float:
         """Composite Simpson's Rule."""
         h = (b - a) / (2.0 * m)
         x = np.linspace(a, b, 2 * m + 1)
         y = self.numeric_f(x)
-        return (y[0] + y[-1] + 2.0 * np.sum(y[1::2]) + 2.0 * np.sum(y[1:-1])) * h / 3.0
+        return (y[0] + y[-1] + 2.0 * self.sum(y[1::2]) + 2.0 * self.sum(y[1:-1])) * h / 3.0
 
 class Romberg(object):
     """
@@ -152,7 +166,7 @@ class Romberg(object):
     def __init__(self, f: sp.Function):
         self.x = sp.Symbol('x')
         self.symbol_f = f
-        self.numeric_f = sp.lambdify(self.x, f, "numpy")
+        self.numeric_f = lambdify(self.x, f, "numpy")
 
     def __call__(self, a: float, b: float, m: int) -> Tuple[float, float]:
         """Romberg integration on `[a, b]` with `m` lines of romberg table."""
@@ -194,7 +208,7 @@ class GaussLegendre(object):
     def __init__(self, f: sp.Function):
         self.x = sp.Symbol('x')
         self.symbol_f = f
-        self.numeric_f = sp.lambdify(self.x, f, "numpy")
+        self.numeric_f = lambdify(self.x, f, "numpy")
 
     def __call__(self, a: float, b: float) -> Tuple[float, float, float, float]:
         """Integration on `[a, b]`."""
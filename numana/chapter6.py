@@ -3,16 +3,19 @@ from typing import Tuple
 import numpy as np
 import sympy as sp
 
+from .cache import compileFunction
+
 class EulerMethod(object):
     """
     Integrator for solving `y' = f(x, y)` with initial value `y(0)`.
     @param `f`: the function to be solve.
+    @param `backend`: how `f` is evaluated, `numpy`, `math` or `numba`.
     """
-    def __init__(self, f: sp.Function):
+    def __init__(self, f: sp.Function, backend: str = "numpy"):
         self.x = sp.Symbol('x')
         self.y = sp.Symbol('y')
         self.symbol_f = f
-        self.numeric_f = sp.lambdify([self.x, self.y], f, "numpy")
+        self.numeric_f = compileFunction([self.x, self.y], f, backend)
 
     def explicit(self, initial: float, num_steps: int = 100, interval: Tuple[float, float] = (0.0, 1.0)):
         """
@@ -31,8 +34,11 @@ class EulerMethod(object):
         xs = np.linspace(start, end, num_steps + 1)
         ys = np.empty(num_steps + 1)
         ys[0] = initial
+        # the steps run on native floats, which avoids the dispatch cost of numpy scalars
+        x, y, f = xs.tolist(), float(ys[0]), self.numeric_f
         for i in range(num_steps):
-            ys[i + 1] = ys[i] + h * self.numeric_f(xs[i], ys[i])
+            y = y + h * f(x[i], y)
+            ys[i + 1] = y
 
         return ys
 
@@ -53,8 +59,10 @@ class EulerMethod(object):
         xs = np.linspace(start, end, num_steps + 1)
         ys = np.empty(num_steps + 1)
         ys[0] = initial
+        x, y, f = xs.tolist(), float(ys[0]), self.numeric_f
         for i in range(num_steps):
-            mid = self.numeric_f(xs[i], ys[i])
-            ys[i + 1] = ys[i] + 0.5 * h * (mid + self.numeric_f(xs[i] + h, ys[i] + h * mid))
+            mid = f(x[i], y)
+            y = y + 0.5 * h * (mid + f(x[i] + h, y + h * mid))
+            ys[i + 1] = y
 
         return ys
@@ -0,0 +1,273 @@
+from typing import Any, Callable, Iterable, Tuple
+
+import numpy as np
+
+class Dual(object):
+    """
+    Dual numbers `a + b epsilon` with `epsilon^2 = 0`, for forward mode automatic differentiation.
+    Any function written with operators and numpy ufuncs carries the derivatives of its arguments along,
+    so that one evaluation gives both the value and the exact derivatives.
+    `value` is an array and `derivative` has one more trailing axis, the derivatives with respect to each seed.
+    """
+    # numpy defers to the reflected operators of duals
+    __array_priority__ = 100
+
+    def __init__(self, value: Any, derivative: Any = None):
+        """
+        @param `value`: the value.
+        @param `derivative`: the derivatives, of shape `value.shape + (k,)`, zero if `None`.
+        """
+        self.value = _inexact(value)
+        if derivative is None:
+            derivative = np.zeros(self.value.shape + (1,), dtype=self.value.dtype)
+        self.derivative = np.asarray(derivative)
+        assert self.derivative.ndim == self.value.ndim + 1, "derivative needs one more trailing axis than value"
+
+    @classmethod
+    def variable(cls, x: Any) -> "Dual":
+        """Seed every element of `x` with derivative 1, for functions acting elementwise."""
+        x = _inexact(x)
+        return cls(x, np.ones(x.shape + (1,), dtype=x.dtype))
+
+    @classmethod
+    def variables(cls, x: Iterable) -> "Dual":
+        """Seed the vector `x` with the identity, for the Jacobian of functions of `x`."""
+        x = _inexact(x)
+        assert x.ndim == 1, "x must be a vector"
+        return cls(x, np.eye(x.size, dtype=x.dtype))
+
+    @classmethod
+    def stack(cls, items: Iterable) -> "Dual":
+        """Stack duals and constants along a new first axis."""
+        items = [_lift(item) for item in items]
+        values = np.broadcast_arrays(*[item.value for item in items])
+        k = max(item.derivative.shape[-1] for item in items)
+        derivatives = [np.broadcast_to(item.derivative, values[0].shape + (k,)) for item in items]
+        return cls(np.stack(values), np.stack(derivatives))
+
+    @property
+    def shape(self) -> tuple:
+        return self.value.shape
+
+    @property
+    def ndim(self) -> int:
+        return self.value.ndim
+
+    def __len__(self) -> int:
+        return len(self.value)
+
+    def __getitem__(self, key: Any) -> "Dual":
+        return Dual(self.value[key], self.derivative[key])
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __repr__(self) -> str:
+        return "Dual({}, {})".format(self.value, self.derivative)
+
+    def _chain(self, value: np.ndarray, slope: np.ndarray) -> "Dual":
+        """The dual of `g(self)` from `value = g(a)` and `slope = g'(a)`."""
+        return Dual(value, np.asarray(slope)[..., np.newaxis] * self.derivative)
+
+    def __neg__(self) -> "Dual":
+        return Dual(-self.value, -self.derivative)
+
+    def __pos__(self) -> "Dual":
+        return self
+
+    def __abs__(self) -> "Dual":
+        return self._chain(np.abs(self.value), np.sign(self.value))
+
+    def __add__(self, other: Any) -> "Dual":
+        other = _lift(other)
+        return Dual(self.value + other.value, self.derivative + other.derivative)
+
+    def __radd__(self, other: Any) -> "Dual":
+        return _lift(other) + self
+
+    def __sub__(self, other: Any) -> "Dual":
+        other = _lift(other)
+        return Dual(self.value - other.value, self.derivative - other.derivative)
+
+    def __rsub__(self, other: Any) -> "Dual":
+        return _lift(other) - self
+
+    def __mul__(self, other: Any) -> "Dual":
+        other = _lift(other)
+        return Dual(
+            self.value * other.value,
+            self.value[..., np.newaxis] * other.derivative + other.value[..., np.newaxis] * self.derivative
+        )
+
+    def __rmul__(self, other: Any) -> "Dual":
+        return _lift(other) * self
+
+    def __truediv__(self, other: Any) -> "Dual":
+        other = _lift(other)
+        value = self.value / other.value
+        # (a / b)' = (a' - (a / b) b') / b
+        return Dual(value, (self.derivative - value[..., np.newaxis] * other.derivative) / other.value[..., np.newaxis])
+
+    def __rtruediv__(self, other: Any) -> "Dual":
+        return _lift(other) / self
+
+    def __pow__(self, other: Any) -> "Dual":
+        if not isinstance(other, Dual):
+            other = np.asarray(other)
+            return self._chain(self.value ** other, other * self.value ** (other - 1))
+        value = self.value ** other.value
+        # (a^b)' = a^b (b' ln a + b a' / a)
+        return Dual(value, value[..., np.newaxis] * (
+            np.log(self.value)[..., np.newaxis] * other.derivative
+            + (other.value / self.value)[..., np.newaxis] * self.derivative
+        ))
+
+    def __rpow__(self, other: Any) -> "Dual":
+        return _lift(other) ** self
+
+    def __matmul__(self, other: Any) -> "Dual":
+        other = _lift(other)
+        # (AB)' = A'B + AB', with the axis of the derivatives moved in front of the matrix axes
+        left = np.moveaxis(np.moveaxis(self.derivative, -1, 0) @ other.value, 0, -1)
+        if other.ndim == 1:
+            right = self.value @ other.derivative
+        else:
+            right = np.moveaxis(self.value @ np.moveaxis(other.derivative, -1, 0), 0, -1)
+        return Dual(self.value @ other.value, left + right)
+
+    def __rmatmul__(self, other: Any) -> "Dual":
+        return _lift(other) @ self
+
+    def __lt__(self, other: Any) -> np.ndarray:
+        return self.value < _lift(other).value
+
+    def __le__(self, other: Any) -> np.ndarray:
+        return self.value <= _lift(other).value
+
+    def __gt__(self, other: Any) -> np.ndarray:
+        return self.value > _lift(other).value
+
+    def __ge__(self, other: Any) -> np.ndarray:
+        return self.value >= _lift(other).value
+
+    def sum(self, axis: Any = None, dtype: Any = None, out: Any = None, keepdims: bool = False) -> "Dual":
+        """Sum of the elements, called by `np.sum` as well."""
+        assert out is None, "duals have no out argument"
+        if axis is None:
+            axes = tuple(range(self.ndim))
+        else:
+            # negative axes count from the last axis of the value, not of the derivative
+            axes = tuple(a % self.ndim for a in (axis if isinstance(axis, tuple) else (axis,)))
+        return Dual(self.value.sum(axis=axes, keepdims=keepdims), self.derivative.sum(axis=axes, keepdims=keepdims))
+
+    def __array_ufunc__(self, ufunc: np.ufunc, method: str, *inputs, **kwargs) -> Any:
+        if method != "__call__" or kwargs:
+            return NotImplemented
+        if ufunc in _BINARY:
+            return _BINARY[ufunc](_lift(inputs[0]), inputs[1])
+        if ufunc in _COMPARISONS:
+            return ufunc(*[_lift(x).value for x in inputs])
+        if ufunc in _UNARY:
+            x = inputs[0]
+            value = ufunc(x.value)
+            return x._chain(value, _UNARY[ufunc](x.value, value))
+        return NotImplemented
+
+def _inexact(x: Any) -> np.ndarray:
+    """`x` as a float or complex array."""
+    x = np.asarray(x)
+    return x if np.issubdtype(x.dtype, np.inexact) else x.astype(float)
+
+def _lift(x: Any) -> Dual:
+    """Constants are duals with zero derivative."""
+    return x if isinstance(x, Dual) else Dual(x)
+
+def _select(a: Dual, b: Any, first: np.ndarray) -> Dual:
+    """`a` where `first` holds, `b` elsewhere, with their derivatives."""
+    b = _lift(b)
+    return Dual(np.where(first, a.value, b.value), np.where(first[..., np.newaxis], a.derivative, b.derivative))
+
+def _hypot(a: Dual, b: Any) -> Dual:
+    b = _lift(b)
+    value = np.hypot(a.value, b.value)
+    return Dual(value, (a.value / value)[..., np.newaxis] * a.derivative + (b.value / value)[..., np.newaxis] * b.derivative)
+
+def _arctan2(a: Dual, b: Any) -> Dual:
+    b = _lift(b)
+    # arctan2(a, b)' = (b a' - a b') / (a^2 + b^2)
+    r2 = a.value * a.value + b.value * b.value
+    return Dual(
+        np.arctan2(a.value, b.value),
+        (b.value / r2)[..., np.newaxis] * a.derivative - (a.value / r2)[..., np.newaxis] * b.derivative
+    )
+
+_BINARY = {
+    np.add: Dual.__add__,
+    np.subtract: Dual.__sub__,
+    np.multiply: Dual.__mul__,
+    np.true_divide: Dual.__truediv__,
+    np.power: Dual.__pow__,
+    np.matmul: Dual.__matmul__,
+    np.maximum: lambda a, b: _select(a, b, a.value >= _lift(b).value),
+    np.minimum: lambda a, b: _select(a, b, a.value <= _lift(b).value),
+    np.hypot: _hypot,
+    np.arctan2: _arctan2,
+}
+
+_COMPARISONS = (np.less, np.less_equal, np.greater, np.greater_equal, np.equal, np.not_equal)
+
+# the derivatives of unary ufuncs from the argument `x` and the value `y`
+_UNARY = {
+    np.negative: lambda x, y: -np.ones_like(x),
+    np.positive: lambda x, y: np.ones_like(x),
+    np.absolute: lambda x, y: np.sign(x),
+    np.square: lambda x, y: 2.0 * x,
+    np.sqrt: lambda x, y: 0.5 / y,
+    np.cbrt: lambda x, y: 1.0 / (3.0 * y * y),
+    np.reciprocal: lambda x, y: -y * y,
+    np.exp: lambda x, y: y,
+    np.exp2: lambda x, y: y * np.log(2.0),
+    np.expm1: lambda x, y: y + 1.0,
+    np.log: lambda x, y: 1.0 / x,
+    np.log2: lambda x, y: 1.0 / (x * np.log(2.0)),
+    np.log10: lambda x, y: 1.0 / (x * np.log(10.0)),
+    np.log1p: lambda x, y: 1.0 / (1.0 + x),
+    np.sin: lambda x, y: np.cos(x),
+    np.cos: lambda x, y: -np.sin(x),
+    np.tan: lambda x, y: 1.0 + y * y,
+    np.arcsin: lambda x, y: 1.0 / np.sqrt(1.0 - x * x),
+    np.arccos: lambda x, y: -1.0 / np.sqrt(1.0 - x * x),
+    np.arctan: lambda x, y: 1.0 / (1.0 + x * x),
+    np.sinh: lambda x, y: np.cosh(x),
+    np.cosh: lambda x, y: np.sinh(x),
+    np.tanh: lambda x, y: 1.0 - y * y,
+    np.arcsinh: lambda x, y: 1.0 / np.sqrt(x * x + 1.0),
+    np.arccosh: lambda x, y: 1.0 / np.sqrt(x * x - 1.0),
+    np.arctanh: lambda x, y: 1.0 / (1.0 - x * x),
+}
+
+def derivative(f: Callable, x: Any, *args) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    @param `f`: a function acting elementwise, written with operators and numpy ufuncs.
+    @param `x`: the point or the array of points.
+    @param `args`: extra arguments of `f`.
+    @return: `f(x), f'(x)` from a single evaluation.
+    """
+    x = Dual.variable(x)
+    y = _lift(f(x, *args))
+    shape = np.broadcast_shapes(x.shape, y.shape)
+    value, slope = np.broadcast_to(y.value, shape), np.broadcast_to(y.derivative[..., 0], shape)
+    return (value[()], slope[()]) if value.ndim == 0 else (value, slope)
+
+def jacobian(F: Callable, x: Iterable) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    @param `F`: a function from vectors to vectors, written with operators and numpy ufuncs,
+        returning a dual vector or a sequence of duals and constants.
+    @param `x`: the point.
+    @return: `F(x), J(x)` from a single evaluation.
+    """
+    x = Dual.variables(x)
+    y = F(x)
+    y = y if isinstance(y, Dual) else Dual.stack(y)
+    return y.value, np.broadcast_to(y.derivative, y.shape + (len(x),))
@@ -0,0 +1,46 @@
+import os
+import sys
+sys.path.append(os.pardir)
+
+import numpy as np
+import pytest
+import sympy as sp
+
+import numana.cache as cache
+import numana.chapter1 as ch1
+import numana.chapter5 as ch5
+
+class TestFunctionCache(object):
+    def testFunctionCache(self):
+        x = sp.Symbol('x')
+        functions = cache.FunctionCache(maxsize=4)
+
+        f = functions.lambdify(x, sp.exp(x) * sp.sin(x))
+        assert functions.lambdify(x, sp.sin(x) * sp.exp(x)) is f
+        df = functions.lambdify(x, sp.exp(x) * sp.sin(x), derivative=1)
+        assert np.isclose(df(1.0), np.exp(1.0) * (np.sin(1.0) + np.cos(1.0)))
+        g = functions.lambdify(x, sp.exp(x) * sp.sin(x) + sp.exp(x) ** 2, cse=True)
+        assert np.isclose(g(1.0), f(1.0) + np.exp(2.0))
+        print("The cache is \033\13334m{}\033\1330m.".format(functions.info()))
+
+        # the least recently used entries are evicted
+        for n in range(8):
+            functions.lambdify(x, x ** n)
+        assert functions.info().currsize == 4
+        assert functions.lambdify(x, sp.exp(x) * sp.sin(x)) is not f
+
+    def testSharedCache(self):
+        x = sp.Symbol('x')
+        f = sp.log(x) + x ** 2 - 3
+        cache.FUNCTIONS.clear()
+        solvers = [ch1.Solver(f) for _ in range(100)]
+        integrators = [ch5.Romberg(f) for _ in range(100)]
+        solvers[0].newton(1.0)
+        solvers[1].newton(1.0)
+        info = cache.FUNCTIONS.info()
+        print("The cache is \033\13334m{}\033\1330m.".format(info))
+        assert info.misses == 4 and info.hits == 199
+
+if __name__ == "__main__":
+    pytest.main(["-s", "test_cache.py::TestFunctionCache::testFunctionCache"])
+    pytest.main(["-s", "test_cache.py::TestFunctionCache::testSharedCache"])
@@ -1,4 +1,5 @@
 import math
+from fractions import Fraction
 import os
 import sys
 from typing import Iterable, Optional, Union
@@ -61,6 +62,81 @@ class TestNest(object):
         self.outputNest(1.00001, np.array([1, -1] * 50))
         print("\033\13334m[{}]\033\1330m.".format((1 - 1.00001) * ch0.nest(1.00001 ** 2, np.ones(50, dtype=int))))
 
+    def testNestBatch(self):
+        coefficients = np.array([[-1, 5, -3, 3, 2], [1, 0, 2, 0, -4], [4, 4, 1, 3, 2]], dtype=float)
+        base_points = np.array([[0, 0, 0, 0], [0, 1, 2, 3], [0, 1, 2, 3]], dtype=float)
+        x = np.linspace(-1.0, 1.0, 5)
+
+        out = np.empty((3, 5))
+        y = ch0.nest(x, coefficients, base_points, out=out)
+        assert y is out
+        for i in range(3):
+            assert np.allclose(y[i], ch0.nest(x, coefficients[i], base_points[i]))
+
+        # one row of points per polynomial
+        xs = np.stack([x, 2.0 * x, 3.0 * x])
+        y = ch0.nest(xs, coefficients)
+        for i in range(3):
+            assert np.allclose(y[i], ch0.nest(xs[i], coefficients[i]))
+        # base points beyond the degree are ignored
+        assert ch0.nest(0.5, [1, 2, 3], [0, 0, 0]) == ch0.nest(0.5, [1, 2, 3])
+        assert np.allclose(ch0.nest(x, coefficients, np.pad(base_points, ((0, 0), (0, 2)))), ch0.nest(x, coefficients, base_points))
+        print("Evaluating \033\13331m{}\033\1330m polynomials, the values are \033\13334m{}\033\1330m.".format(coefficients.shape[0], y))
+
+    def testPolynomial(self):
+        x = sp.Symbol('x')
+        polynomial = ch0.Polynomial([1, 0.5, 0.5, -0.5], [0, 2, 3])
+        expression = 1 + (x + 3) * (0.5 + (x + 2) * (0.5 + x * -0.5))
+        for point in [-1.0, 0.5, 5.0]:
+            p, dp, ddp = polynomial.derivatives(point, second=True)
+            assert np.isclose(p, float(expression.subs(x, point)))
+            assert np.isclose(dp, float(sp.diff(expression, x).subs(x, point)))
+            assert np.isclose(ddp, float(sp.diff(expression, x, 2).subs(x, point)))
+            print("Evaluating \033\13331m[{}]\033\1330m at x = {}, the value and derivatives are \033\13334m[{}, {}, {}]\033\1330m.".format(sp.expand(expression), point, p, dp, ddp))
+
+    def testCompensatedNest(self, monkeypatch):
+        # (x - 1)^7 in expanded form loses every digit near x = 1
+        coefficients = [-1, 7, -21, 35, -35, 21, -7, 1]
+        x = np.linspace(0.99, 1.01, 5)
+        y = ch0.nest(x, coefficients, compensated=True)
+        assert np.allclose(y, (x - 1) ** 7, rtol=1e-10, atol=0.0)
+        print("Evaluating \033\13331m(x - 1)^7\033\1330m at x = {}, the naive values are {} and the compensated values are \033\13334m{}\033\1330m.".format(x, ch0.nest(x, coefficients), y))
+        # the points are evaluated by blocks, which must not change the values
+        rng = np.random.default_rng(0)
+        x = rng.standard_normal(100)
+        polynomials = [
+            ch0.Polynomial(coefficients),
+            ch0.Polynomial(rng.standard_normal((30, 5)), rng.standard_normal((30, 4))),
+        ]
+        expected = [[p.compensated(x), p.compensated(0.5)] for p in polynomials]
+        monkeypatch.setattr(ch0, "COMPENSATED_BLOCK", 7)
+        for p, (values, value) in zip(polynomials, expected):
+            assert np.array_equal(p.compensated(x), values) and np.array_equal(p.compensated(0.5), value)
+
+    def testRoots(self):
+        # roots of unity
+        coefficients = np.zeros(26)
+        coefficients[[0, -1]] = -1, 1
+        for method in ["aberth", "companion"]:
+            roots = ch0.Polynomial(coefficients).roots(method)
+            print("Using \033\13331m{}\033\1330m, the roots of \033\13331mx^25 - 1\033\1330m are \033\13334m{}\033\1330m.".format(method, roots))
+            assert np.allclose(roots ** 25, 1.0, rtol=0.0, atol=1e-12)
+        # Wilkinson's polynomial
+        roots = ch0.Polynomial(np.polynomial.polynomial.polyfromroots(np.arange(1, 21))).roots()
+        assert np.allclose(roots, np.arange(1, 21), rtol=1e-1)
+        # a batch of polynomials sharing a degree
+        coefficients = np.random.default_rng(0).standard_normal((100, 9))
+        aberth = ch0.Polynomial(coefficients).roots()
+        companion = ch0.Polynomial(coefficients).roots("companion")
+        assert aberth.shape == (100, 8)
+        assert np.abs(aberth[:, :, np.newaxis] - companion[:, np.newaxis, :]).min(axis=-1).max() < 1e-10
+
+    def testCompensatedSum(self):
+        x = np.array([1e100, 1.0, -1e100] * 1000 + [0.1] * 10000)
+        for summation in [np.sum, ch0.kahanSum, ch0.neumaierSum, ch0.pairwiseSum]:
+            print("Using \033\13331m{}\033\1330m, the sum is \033\13334m[{}]\033\1330m.".format(summation.__name__, summation(x)))
+        assert ch0.neumaierSum(x) == math.fsum(x)
+
 class TestSignificance(object):
     def setup(self):
         self.x = sp.Symbol('x')
@@ -74,6 +150,43 @@ class TestSignificance(object):
         self.outputQuadratic(1, 3, 8 ** -14)
         self.outputQuadratic(1, 100, 1e-12)
 
+    def testQuadraticBatch(self):
+        a = np.array([1, 1, 1, 0, 1, 0])
+        b = np.array([-3, 3, 100, 2, 0, 0])
+        c = np.array([2, 8 ** -14, 1e-12, 4, 1, 1])
+        roots, mask = ch0.quadraticBatch(a, b, c)
+        assert np.array_equal(mask.all(axis=-1), [True, True, True, True, False, False])
+        assert np.allclose(roots[2], [-100.0, -1e-14], rtol=1e-15)
+        print("Solving \033\13331m{}\033\1330m equations, the solutions are \033\13334m{}\033\1330m.".format(a.shape[0], roots))
+
+        roots, mask = ch0.quadraticBatch(1, 0, 1, complex_roots=True)
+        assert mask.all() and np.allclose(np.sort_complex(roots), [-1j, 1j])
+
+    def testCubicBatch(self):
+        a = np.array([1, 1, 0, 2, 1e-5])
+        b = np.array([-6, 0, 1, 0, -1.6])
+        c = np.array([11, 1, -3, 0, -0.13])
+        d = np.array([-6, 0, 2, 0, 0.0058])
+        roots, mask = ch0.cubicBatch(a, b, c, d, complex_roots=True)
+        for i in range(a.shape[0]):
+            expected = np.roots([a[i], b[i], c[i], d[i]])
+            assert np.allclose(np.sort_complex(roots[i][mask[i]]), np.sort_complex(expected))
+        print("Solving \033\13331m{}\033\1330m equations, the solutions are \033\13334m{}\033\1330m.".format(a.shape[0], roots))
+
+        roots, mask = ch0.cubicBatch(a, b, c, d)
+        assert np.array_equal(mask.sum(axis=-1), [3, 1, 2, 3, 3])
+
+        # double and triple roots are real, even though rounding leaves R^2 - Q^3 slightly off zero
+        roots, mask = ch0.cubicBatch(1, 1, -33, 63)
+        assert mask.all() and np.allclose(np.sort(roots), [-7, 3, 3])
+        roots, mask = ch0.cubicBatch(1, -0.3, 0.03, -0.001)
+        assert mask.all() and np.allclose(roots, 0.1, atol=1e-5)
+        rng = np.random.default_rng(0)
+        double, single = rng.uniform(-10, 10, (2, 1000))
+        roots, mask = ch0.cubicBatch(1, -(2 * double + single), double * (double + 2 * single), -double * double * single)
+        assert mask.all()
+        assert np.allclose(np.sort(roots, axis=-1), np.sort(np.stack([double, double, single], axis=-1), axis=-1), atol=1e-5)
+
     def testSignificance(self):
         x = np.logspace(-1, -14, 14)
         print((1 - 1 / np.cos(x)) / (np.tan(x) * np.tan(x)))
@@ -163,9 +276,38 @@ class TestBinaryDecimal(object):
         self.outputBin2dec('10111.10', (0, 1))
         self.outputBin2dec('1111.010001', (3, 5))
 
+    def testBin2decExact(self):
+        self.outputBin2dec('0.' + '01' * 100, (0, 199))
+        assert ch0.bin2dec('0.' + '01' * 100, (0, 199), exact=True) == Fraction(1, 3)
+        assert ch0.bin2dec('10.0101101', (3, 6), exact=True) == Fraction(283, 120)
+
+        # exact up to the final rounding, far past 53 bits
+        bina = '1.' + '0' * 60 + '1' * 100000
+        assert ch0.bin2dec(bina) == float(ch0.bin2dec(bina, exact=True))
+        print("Convert \033\13331m[{}...]\033\1330m into \033\13334m[{}]\033\1330m.".format(bina[:80], ch0.bin2dec(bina)))
+
+    def testBinaryDecimalBatch(self):
+        deci = np.array([64, 1 / 8, -35 / 16, 0.1, 3.1415926535897932, 1e-310, np.inf])
+        for dtype in [np.float64, np.float32]:
+            bina = ch0.dec2binBatch(deci, dtype, as_bytes=True)
+            sign, exponent, mantissa = ch0.floatFields(deci, dtype)
+            assert np.array_equal(ch0.bin2decBatch(bina, dtype), deci.astype(dtype))
+            assert np.array_equal(ch0.bin2decBatch(ch0.dec2binBatch(deci, dtype), dtype), deci.astype(dtype))
+            for d, b, s, e, m in zip(deci, bina, sign, exponent, mantissa):
+                print("Convert \033\13331m[{}]\033\1330m into \033\13334m[{}]\033\1330m, fields [{}, {}, {}].".format(d, b.decode(), s, e, m))
+
 if __name__ == "__main__":
     pytest.main(["-s", "test_ch0.py::TestNest::testNest"])
+    pytest.main(["-s", "test_ch0.py::TestNest::testNestBatch"])
+    pytest.main(["-s", "test_ch0.py::TestNest::testPolynomial"])
+    pytest.main(["-s", "test_ch0.py::TestNest::testCompensatedNest"])
+    pytest.main(["-s", "test_ch0.py::TestNest::testRoots"])
+    pytest.main(["-s", "test_ch0.py::TestNest::testCompensatedSum"])
     pytest.main(["-s", "test_ch0.py::TestSignificance::testQuadratic"])
+    pytest.main(["-s", "test_ch0.py::TestSignificance::testQuadraticBatch"])
+    pytest.main(["-s", "test_ch0.py::TestSignificance::testCubicBatch"])
     pytest.main(["-s", "test_ch0.py::TestSignificance::testSignificance"])
     pytest.main(["-s", "test_ch0.py::TestBinaryDecimal::testDec2bin"])
     pytest.main(["-s", "test_ch0.py::TestBinaryDecimal::testBin2dec"])
+    pytest.main(["-s", "test_ch0.py::TestBinaryDecimal::testBin2decExact"])
+    pytest.main(["-s", "test_ch0.py::TestBinaryDecimal::testBinaryDecimalBatch"])
@@ -83,6 +83,33 @@ class TestFixedPointIteration(object):
         # (7)
         self.outputFixedPointIteration(1 - 5 * x + 15 / 2 * x ** 2 - 5 / 2 * x ** 3, 2.18)
 
+    def outputAcceleration(self, f: sp.Function, a: float, acceleration: str) -> ch1.SolverResult:
+        result = ch1.Solver(f).fixedPointIteration(a, acceleration=acceleration, full_output=True)
+        print("Using \033\13331m{}\033\1330m on \033\13331mf(x) = {}\033\1330m: \033\13334m{}\033\1330m.".format(acceleration, f, result))
+        return result
+
+    def testAcceleration(self) -> None:
+        x = sp.Symbol('x')
+        # contraction constant 1 - 0.02 sqrt(2), close to 1
+        f = x - (x ** 2 - 2) / 100
+        plain = self.outputAcceleration(f, 1.0, None)
+        for acceleration in ("steffensen", "anderson"):
+            result = self.outputAcceleration(f, 1.0, acceleration)
+            assert result.converged and result.evaluations * 10 < plain.evaluations
+            assert abs(result.root - np.sqrt(2)) < 1e-14
+        result = self.outputAcceleration(sp.cos(x), 1.0, "aitken")
+        assert result.evaluations < self.outputAcceleration(sp.cos(x), 1.0, None).evaluations
+        assert abs(result.root - 0.7390851332151607) < 1e-12
+
+    def testAndersonMixing(self) -> None:
+        A = np.diag(np.linspace(0.1, 0.97, 20))
+        c = np.ones(20)
+        result = ch1.andersonMixing(lambda x: A @ x + c, np.zeros(20), depth=10, full_output=True)
+        plain = ch1.andersonMixing(lambda x: A @ x + c, np.zeros(20), depth=0, full_output=True)
+        print("Anderson mixing: \033\13334m{} evaluations\033\1330m, plain iteration: \033\13334m{} evaluations\033\1330m.".format(result.evaluations, plain.evaluations))
+        assert result.converged and result.evaluations < plain.evaluations
+        assert np.allclose(result.root, c / (1 - np.diag(A)))
+
 class TestNewton(object):
     def outputNewton(self, f: sp.Function, a: float) -> None:
         solver = ch1.Solver(f)
@@ -115,6 +142,17 @@ class TestNewton(object):
         # (3)
         self.outputNewton(27 * x ** 3 + 54 * x ** 2 + 36 * x + 8, -1.0)
 
+    def testAutomaticDerivative(self):
+        x = sp.Symbol('x')
+        f = sp.exp(x) + sp.sin(x) - 4
+        for backend in ["numpy", "math"]:
+            solver = ch1.Solver(f, backend=backend)
+            assert np.isclose(solver.newton(1.0, derivative="automatic"), solver.newton(1.0))
+        # plain functions have no expression to differentiate
+        result = ch1.Solver(lambda x: np.exp(x) + np.sin(x) - 4).newton(1.0, full_output=True)
+        print("Using dual numbers, the result is: \033\13334m{}\033\1330m.".format(result))
+        assert result.converged and np.isclose(result.root, ch1.Solver(f).brent(1.0, 2.0))
+
 class TestSecant(object):
     def outputSecant(self, f: sp.Function, a: float, b: float) -> None:
         solver = ch1.Solver(f)
@@ -155,10 +193,183 @@ class TestInverseInterpolation(object):
         self.outputInverseInterpolation(sp.exp(x) + x - 7, 1.0, 2.0, 0.0)
         self.outputInverseInterpolation(sp.exp(x) + sp.sin(x) - 4, 1.0, 2.0, 0.0)
 
+class TestBrent(object):
+    def outputBrent(self, f: sp.Function, a: float, b: float) -> None:
+        solver = ch1.Solver(f)
+        result = solver.brent(a, b)
+        print("The function is \033\13331mf(x) = {}\033\1330m and the interval is \033\13331m[{}, {}]\033\1330m.".format(f, a, b))
+        print("The result is: \033\13334m[{}]\033\1330m.".format(result))
+        assert np.isclose(result, solver.bisection(a, b))
+
+    def testBrent(self) -> None:
+        x = sp.Symbol('x')
+        self.outputBrent(x ** 3 + x - 1, 0.0, 1.0)
+        self.outputBrent(sp.cos(x) - x, 0.0, 1.0)
+        self.outputBrent(x ** 3 - 2 * x - 2, 1.0, 2.0)
+        self.outputBrent(sp.exp(x) + x - 7, 1.0, 2.0)
+        self.outputBrent(sp.exp(x) + sp.sin(x) - 4, 1.0, 2.0)
+        # regula falsi stalls on these
+        self.outputBrent(x ** 10 - 1, 0.0, 1.3)
+        self.outputBrent((x - 1) ** 3, 0.0, 3.0)
+
+class TestSymbolic(object):
+    def testSymbolic(self) -> None:
+        x = sp.Symbol('x')
+        f = x ** 3 - 2 * x - 2
+        assert ch1.Solver(f).symbolic() == sp.solve(f, x)
+        # no closed form above degree 4, the roots are found numerically
+        f = x ** 24 - 3 * x ** 7 + 5 * x - 2
+        roots = ch1.Solver(f).symbolic()
+        print("The roots of \033\13331mf(x) = {}\033\1330m are: \033\13334m{}\033\1330m.".format(f, roots))
+        assert len(roots) == 24
+        expected = np.roots([float(c) for c in sp.Poly(f, x).all_coeffs()])
+        assert np.abs(np.array(roots)[:, np.newaxis] - expected).min(axis=-1).max() < 1e-12
+
+class TestScan(object):
+    def outputScan(self, f: sp.Function, a: float, b: float, **kwargs) -> np.ndarray:
+        roots = ch1.Solver(f).scan(a, b, **kwargs)
+        print("The roots of \033\13331mf(x) = {}\033\1330m in \033\13331m[{}, {}]\033\1330m are: \033\13334m{}\033\1330m.".format(f, a, b, roots))
+        return roots
+
+    def testScan(self) -> None:
+        x = sp.Symbol('x')
+        assert np.allclose(self.outputScan(sp.sin(x), 0.5, 20.0), np.pi * np.arange(1, 7))
+        assert np.allclose(self.outputScan(x ** 3 - x, -2.0, 2.0, samples=4), [-1.0, 0.0, 1.0])
+        # a close pair of roots between two samples is found by the adaptive sampling
+        assert self.outputScan(x ** 2 - 1e-6, -1.0, 1.1, samples=20, depth=0).size == 0
+        assert np.allclose(self.outputScan(x ** 2 - 1e-6, -1.0, 1.1, samples=20), [-1e-3, 1e-3])
+        roots = self.outputScan((x - 1) * (x - 1.001) * (x - 2), 0.0, 3.0, samples=100, method="regulaFalsi")
+        assert np.allclose(roots, [1.0, 1.001, 2.0])
+        assert np.array_equal(self.outputScan(sp.sin(x), 0.5, 20.0, workers=2), self.outputScan(sp.sin(x), 0.5, 20.0))
+        # lambdas cannot be sent to the workers, they are refined in this process
+        roots = ch1.Solver(lambda t: np.sin(t)).scan(0.5, 10.0, workers=2)
+        assert np.allclose(roots, np.pi * np.arange(1, 4))
+
+class TestBackend(object):
+    def outputBackend(self, f: sp.Function, backend: str) -> None:
+        solver = ch1.Solver(f, backend=backend)
+        result = (solver.newton(1.0), solver.secant(1.0, 2.0), solver.brent(1.0, 2.0))
+        print("Using the \033\13331m{}\033\1330m backend, the results are: \033\13334m{}\033\1330m.".format(backend, result))
+        assert np.allclose(result, ch1.Solver(f).newton(1.0))
+
+    def testBackend(self) -> None:
+        x = sp.Symbol('x')
+        self.outputBackend(sp.exp(x) + sp.sin(x) - 4, "numpy")
+        self.outputBackend(sp.exp(x) + sp.sin(x) - 4, "math")
+
+    def testBackendBreakdown(self) -> None:
+        # native floats raise on zero divisions, overflows and domain errors where numpy returns infinity or not a number
+        x = sp.Symbol('x')
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            for backend in ["numpy", "math"]:
+                assert ch1.Solver(x ** 2 - 2, backend=backend).newton(0.0, full_output=True).converged is False
+                assert ch1.Solver(x ** 2 - 2, backend=backend).secant(-1.0, 1.0, full_output=True).converged is False
+                assert ch1.Solver(sp.exp(x) - 1, backend=backend).newton(-800.0, full_output=True).converged is False
+                assert ch1.Solver(sp.log(x) - 1, backend=backend).newton(10.0, full_output=True).converged is False
+
+    def testNumbaBackend(self) -> None:
+        pytest.importorskip("numba")
+        x = sp.Symbol('x')
+        self.outputBackend(sp.exp(x) + sp.sin(x) - 4, "numba")
+
+class TestInstrumentation(object):
+    def outputResult(self, method: str, f: sp.Function, *initials) -> ch1.SolverResult:
+        solver = ch1.Solver(f)
+        iterates = []
+        result = getattr(solver, method)(*initials, full_output=True, trace=True, callback=lambda i, x, fx: iterates.append(x))
+        print("Using \033\13331m{}\033\1330m on \033\13331mf(x) = {}\033\1330m: \033\13334m{}\033\1330m.".format(method, f, result._replace(trace=None)))
+        assert len(iterates) == len(result.trace) == result.iterations
+        return result
+
+    def testInstrumentation(self) -> None:
+        x = sp.Symbol('x')
+        f = sp.exp(x) + x - 7
+        self.outputResult("bisection", f, 1.0, 2.0)
+        self.outputResult("newton", f, 1.0)
+        self.outputResult("secant", f, 1.0, 2.0)
+        self.outputResult("regulaFalsi", f, 1.0, 2.0)
+        self.outputResult("inverseInterpolation", f, 1.0, 2.0, 0.0)
+        self.outputResult("brent", f, 1.0, 2.0)
+        assert self.outputResult("fixedPointIteration", sp.cos(x), 1.0).converged
+        # fixed point iteration no longer gives up silently
+        assert not self.outputResult("fixedPointIteration", 1 - x ** 3, 0.5).converged
+
+class TestStopping(object):
+    def outputStopping(self, method: str, f: sp.Function, stopping: ch1.Stopping, *initials) -> ch1.SolverResult:
+        result = getattr(ch1.Solver(f), method)(*initials, stopping=stopping, full_output=True)
+        print("Using \033\13331m{}\033\1330m on \033\13331mf(x) = {}\033\1330m: \033\13334m{}\033\1330m.".format(method, f, result))
+        return result
+
+    def testStopping(self) -> None:
+        x = sp.Symbol('x')
+        f = sp.exp(x) + x - 7
+        loose = self.outputStopping("bisection", f, ch1.Stopping(xtol=1e-3, rtol=0.0), 1.0, 2.0)
+        tight = self.outputStopping("bisection", f, ch1.Stopping(), 1.0, 2.0)
+        assert loose.converged and loose.iterations < tight.iterations
+        assert abs(self.outputStopping("newton", f, ch1.Stopping(ftol=1e-6), 1.0).residual) <= 1e-6
+        # caps end the run without convergence
+        capped = self.outputStopping("bisection", f, ch1.Stopping(max_iterations=5), 1.0, 2.0)
+        assert not capped.converged and capped.iterations == 5
+        capped = self.outputStopping("secant", f, ch1.Stopping(max_evaluations=4), 1.0, 2.0)
+        assert not capped.converged and capped.evaluations == 4
+        # a double root is approached linearly, Newton's step hits the cap before the tolerance
+        capped = self.outputStopping("newton", (x - 1) ** 2 * sp.exp(x), ch1.Stopping(max_iterations=10), 3.0)
+        assert not capped.converged
+        roots, iterations, converged = ch1.Solver(f).bisectionBatch(np.array([1.0, 1.0]), np.array([2.0, 3.0]), stopping=ch1.Stopping(max_iterations=5))
+        print("Capped batch: \033\13334m{}, {}, {}\033\1330m.".format(roots, iterations, converged))
+        assert not converged.any() and (iterations == 5).all()
+        # steps to infinity never count as converged
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            # a zero derivative at the start
+            assert ch1.Solver(x ** 2 - 2).newton(0.0, full_output=True).converged is False
+            # Newton's steps on the arctangent overshoot further and further
+            assert ch1.Solver(sp.atan(x)).newton(3.0, full_output=True).converged is False
+            # a horizontal secant
+            assert ch1.Solver(x ** 2 - 2).secant(-1.0, 1.0, full_output=True).converged is False
+            assert ch1.Solver(x ** 2 - 2).inverseInterpolation(-1.0, 1.0, 0.0, full_output=True).converged is False
+            diverged = ch1.Solver(x ** 2).fixedPointIteration(2, full_output=True)
+            assert diverged.converged is False and diverged.root == np.inf
+        # two evaluations leave no iteration, the batch still returns its first estimate
+        roots, iterations, converged = ch1.Solver(f).bisectionBatch([1.0], [2.0], stopping=ch1.Stopping(max_evaluations=2))
+        assert not converged.any() and (iterations == 0).all() and np.allclose(roots, 1.5)
+        roots, iterations, converged = ch1.Solver(f).secantBatch([1.0], [2.0], stopping=ch1.Stopping(max_evaluations=2))
+        assert not converged.any() and np.allclose(roots, 2.0)
+
+class TestBatch(object):
+    def outputBatch(self, method: str, f: sp.Function, parameters: tuple, a, b, args: tuple) -> None:
+        solver = ch1.Solver(f, parameters)
+        root, iterations, converged = getattr(solver, method)(a, b, args)
+        print("The function is \033\13331mf(x) = {}\033\1330m with parameters \033\13331m{}\033\1330m.".format(f, args))
+        print("The result is: \033\13334m{}\033\1330m after {} iterations, converged {}.".format(root, iterations, converged))
+        return root, converged
+
+    def testBatch(self) -> None:
+        x, p = sp.symbols('x p')
+        parameters = np.linspace(1.0, 10.0, 7)
+        for method in ["bisectionBatch", "regulaFalsiBatch", "secantBatch"]:
+            root, converged = self.outputBatch(method, x ** 3 + x - p, (p,), 0.0, 3.0, (parameters,))
+            assert converged.all() and np.allclose(root ** 3 + root - parameters, 0.0)
+
+        # lanes stop on their own, the second interval does not change sign
+        root, converged = self.outputBatch("bisectionBatch", sp.cos(x) - x, (), [0.0, 2.0], [1.0, 3.0], ())
+        assert np.array_equal(converged, [True, False]) and np.isnan(root[1])
+
 if __name__ == "__main__":
     pytest.main(["-s", "test_ch1.py::TestBisection::testBisection"])
     pytest.main(["-s", "test_ch1.py::TestFixedPointIteration::testFixedPointIteration"])
+    pytest.main(["-s", "test_ch1.py::TestFixedPointIteration::testAcceleration"])
+    pytest.main(["-s", "test_ch1.py::TestFixedPointIteration::testAndersonMixing"])
     pytest.main(["-s", "test_ch1.py::TestNewton::testNewton"])
+    pytest.main(["-s", "test_ch1.py::TestNewton::testAutomaticDerivative"])
     pytest.main(["-s", "test_ch1.py::TestSecant::testSecant"])
     pytest.main(["-s", "test_ch1.py::TestRegulaFalsi::testRegulaFalsi"])
     pytest.main(["-s", "test_ch1.py::TestInverseInterpolation::testInverseInterpolation"])
+    pytest.main(["-s", "test_ch1.py::TestBrent::testBrent"])
+    pytest.main(["-s", "test_ch1.py::TestSymbolic::testSymbolic"])
+    pytest.main(["-s", "test_ch1.py::TestScan::testScan"])
+    pytest.main(["-s", "test_ch1.py::TestBackend::testBackend"])
+    pytest.main(["-s", "test_ch1.py::TestBackend::testBackendBreakdown"])
+    pytest.main(["-s", "test_ch1.py::TestBackend::testNumbaBackend"])
+    pytest.main(["-s", "test_ch1.py::TestInstrumentation::testInstrumentation"])
+    pytest.main(["-s", "test_ch1.py::TestStopping::testStopping"])
+    pytest.main(["-s", "test_ch1.py::TestBatch::testBatch"])
@@ -106,6 +106,26 @@ class TestGaussJordan(object):
         b = np.array([2, 8, 5])[:, np.newaxis]
         self.outputGaussJordan(A, b)
 
+    def testGaussJordanReuse(self):
+        A = np.array([
+            [ 3, -4, -2],
+            [ 6, -6,  1],
+            [-3,  8,  2]
+        ])
+        gauss = ch2.GaussJordan(A)
+        B = np.array([
+            [3, 1, 0],
+            [2, 0, 1],
+            [-1, 2, 5]
+        ])
+        X = gauss.solve(B)
+        self.outputGaussJordan(A, B)
+        assert np.allclose(A @ X, B)
+        # the elimination is kept, every column gives the same solution on its own
+        for k in range(B.shape[1]):
+            assert np.allclose(gauss.solve(B[:, k]), X[:, k])
+        assert np.array_equal(A, [[3, -4, -2], [6, -6, 1], [-3, 8, 2]])
+
 class TestLU(object):
     def outputLUDecomposition(self, A: np.ndarray):
         lu = ch2.LU(A)
@@ -193,6 +213,71 @@ class TestLU(object):
         b = np.array([2, 4, 6])
         self.outputLUSolve(A, b)
 
+    def testLUSolveBlock(self):
+        A = np.array([
+            [4, 2, 0],
+            [4, 4, 2],
+            [2, 2, 3]
+        ])
+        B = np.array([
+            [2, 1, 0, 3],
+            [4, 0, 1, 3],
+            [6, 0, 0, 1]
+        ])
+        self.outputLUSolve(A, B)
+        lu = ch2.LU(A)
+        X = lu.solve(B)
+        assert X.shape == B.shape and np.allclose(A @ X, B)
+        for k in range(B.shape[1]):
+            assert np.allclose(lu.solve(B[:, k]), X[:, k])
+
+    def testTriangularSolve(self):
+        rng = np.random.default_rng(0)
+        L = np.tril(rng.standard_normal((150, 150)), -1) / 150 + np.diag(rng.uniform(1, 2, 150))
+        B = rng.standard_normal((150, 7))
+        for block_size in [1, 16, 64, 200]:
+            assert np.allclose(L @ ch2.forwardSubstitution(L, B, block_size=block_size), B)
+            assert np.allclose(L.T @ ch2.backSubstitution(L.T, B, block_size=block_size), B)
+        # the diagonal is not read for unit triangles
+        unit = np.tril(L, -1) + np.eye(150)
+        assert np.allclose(unit @ ch2.forwardSubstitution(L, B[:, 0], unit=True), B[:, 0])
+
+class TestPLU(object):
+    def outputPLU(self, A: np.ndarray, b: np.ndarray, block_size: int = 64):
+        plu = ch2.PLU(A, block_size)
+        x = plu.solve(b)
+        print("Solved \033\13331m{}\033\1330m\n\033\13334m{}\n{}\n{}\033\1330m.".format(repr(sp.Matrix(A)), plu.perm, repr(sp.Matrix(plu.L)), repr(sp.Matrix(plu.U))))
+        assert np.allclose(plu.P @ A, plu.L @ plu.U)
+        assert np.allclose(A @ x, b)
+        assert np.isclose(plu.det(), np.linalg.det(A))
+        return plu
+
+    def testPLU(self):
+        # zero pivots stop the factorization without pivoting
+        A = np.array([
+            [0, 1, 2],
+            [1, 0, 3],
+            [4, -3, 8]
+        ])
+        self.outputPLU(A, np.array([2, 4, 5]))
+        A = np.array([
+            [1, 2, -1],
+            [2, 1, -2],
+            [-3, 1, 1]
+        ])
+        self.outputPLU(A, np.array([[3, 1], [3, 0], [-6, 2]]), block_size=2)
+
+        # blocked and unblocked factorizations agree
+        A = np.random.default_rng(0).standard_normal((200, 200))
+        b = np.arange(200.0)
+        blocked = ch2.PLU(A, 32)
+        unblocked = ch2.PLU(A, 1)
+        assert np.array_equal(blocked.perm, unblocked.perm)
+        assert np.allclose(blocked.LU, unblocked.LU)
+        assert np.allclose(A @ blocked.solve(b), b)
+        sign, logdet = blocked.logdet()
+        assert np.allclose([sign, logdet], np.linalg.slogdet(A))
+
 class TestCholesky(object):
     def outputCholesky(self, A: np.ndarray):
         c = ch2.Cholesky(A)
@@ -216,7 +301,297 @@ class TestCholesky(object):
         ])
         self.outputCholesky(self.A)
 
+    def testCholeskyBlocked(self):
+        M = np.random.default_rng(0).standard_normal((150, 150))
+        A = M @ M.T + 150 * np.eye(150)
+        for block_size in [1, 16, 64, 200]:
+            assert np.allclose(ch2.Cholesky(A, block_size).R, np.linalg.cholesky(A))
+        # only the lower triangle is read
+        assert np.allclose(ch2.Cholesky(np.tril(A)).R, np.linalg.cholesky(A))
+        B = A.copy()
+        assert ch2.Cholesky(B, overwrite_a=True).R is B
+        assert np.allclose(B, np.linalg.cholesky(A))
+        with pytest.raises(AssertionError):
+            ch2.Cholesky(np.array([[1, 2], [2, 1]]))
+        with pytest.raises(AssertionError):
+            ch2.Cholesky(np.array([[1, 2], [0, 5]]), check_symmetry=True)
+
+    def testCholeskySolve(self):
+        A = np.array([
+            [1, -1, 2, 0],
+            [-1, 5, -8, 2],
+            [2, -8, 14, -1],
+            [0, 2, -1, 14]
+        ])
+        B = np.array([
+            [1, 0],
+            [0, 1],
+            [2, 3],
+            [-1, 5]
+        ])
+        X = ch2.Cholesky(A).solve(B)
+        print("Solved \033\13331m{}\033\1330m\n\033\13334m{}\033\1330m\n\033\13331m{}\033\1330m.".format(repr(sp.Matrix(A)), repr(sp.Matrix(X)), repr(sp.Matrix(B))))
+        assert np.allclose(A @ X, B)
+        assert np.allclose(ch2.Cholesky(A).solve(B[:, 1]), X[:, 1])
+
+class TestBatch(object):
+    def testGaussJordanBatch(self):
+        rng = np.random.default_rng(0)
+        # diagonally dominant, so no pivoting is needed
+        A = rng.standard_normal((1000, 4, 4)) + 8 * np.eye(4)
+        A[7] = 0.0
+        b = rng.standard_normal((1000, 4))
+        solver = ch2.GaussJordanBatch(A)
+        x = solver.solve(b)
+        print("Failed matrices \033\13331m{}\033\1330m.".format(np.flatnonzero(solver.failed)))
+        assert np.array_equal(np.flatnonzero(solver.failed), [7]) and np.all(np.isnan(x[7]))
+        ok = ~solver.failed
+        assert np.allclose(x[ok], np.linalg.solve(A[ok], b[ok][..., np.newaxis])[..., 0])
+
+    def testLUBatch(self):
+        rng = np.random.default_rng(1)
+        A = rng.standard_normal((1000, 5, 5))
+        # a zero leading pivot only fails without pivoting, a zero column always fails
+        A[3, 0, 0] = 0.0
+        A[5, :, 2] = 0.0
+        B = rng.standard_normal((1000, 5, 2))
+        solver = ch2.LUBatch(A)
+        print("Failed matrices \033\13331m{}\033\1330m.".format(np.flatnonzero(solver.failed)))
+        assert np.array_equal(np.flatnonzero(solver.failed), [5])
+        ok = ~solver.failed
+        assert np.allclose(solver.P[ok] @ A[ok], solver.L[ok] @ solver.U[ok])
+        X = solver.solve(B)
+        assert np.allclose(A[ok] @ X[ok], B[ok]) and np.all(np.isnan(X[5]))
+        assert np.allclose(solver.solve(B[..., 1]), X[..., 1], equal_nan=True)
+        assert np.array_equal(np.flatnonzero(ch2.LUBatch(A, pivoting=False).failed), [3, 5])
+
+    def testCholeskyBatch(self):
+        rng = np.random.default_rng(2)
+        M = rng.standard_normal((1000, 6, 6))
+        A = M @ M.transpose(0, 2, 1) + 0.1 * np.eye(6)
+        A[11] = -np.eye(6)
+        b = rng.standard_normal((1000, 6))
+        solver = ch2.CholeskyBatch(A)
+        print("Failed matrices \033\13331m{}\033\1330m.".format(np.flatnonzero(solver.failed)))
+        assert np.array_equal(np.flatnonzero(solver.failed), [11])
+        ok = ~solver.failed
+        assert np.allclose(solver.R[ok], np.linalg.cholesky(A[ok]))
+        x = solver.solve(b)
+        assert np.allclose((A[ok] @ x[ok][..., np.newaxis])[..., 0], b[ok]) and np.all(np.isnan(x[11]))
+
+class TestBanded(object):
+    def band(self, A: np.ndarray, l: int, u: int) -> np.ndarray:
+        """The diagonal ordered storage `ab[u + i - j, j] = A[i, j]`."""
+        n = A.shape[0]
+        ab = np.zeros((l + u + 1, n))
+        for i in range(n):
+            for j in range(max(0, i - l), min(n, i + u + 1)):
+                ab[u + i - j, j] = A[i, j]
+        return ab
+
+    def testTridiagonal(self):
+        # the second difference matrix of 1D diffusion
+        n = 8
+        A = 2 * np.eye(n) - np.eye(n, k=1) - np.eye(n, k=-1)
+        b = np.ones(n)
+        x = ch2.Tridiagonal(-np.ones(n - 1), 2 * np.ones(n), -np.ones(n - 1)).solve(b)
+        print("Solved \033\13331m{}\033\1330m\n\033\13334m{}\033\1330m.".format(repr(sp.Matrix(A)), x))
+        assert np.allclose(A @ x, b)
+
+        # a batch of independent systems
+        rng = np.random.default_rng(0)
+        lower, upper = rng.standard_normal((20, n - 1)), rng.standard_normal((20, n - 1))
+        diagonal = 4 + rng.standard_normal((20, n))
+        d = rng.standard_normal((20, n))
+        x = ch2.Tridiagonal(lower, diagonal, upper).solve(d)
+        assert x.shape == (20, n)
+        for k in range(20):
+            A = np.diag(diagonal[k]) + np.diag(lower[k], -1) + np.diag(upper[k], 1)
+            assert np.allclose(A @ x[k], d[k])
+
+    def testBandedLU(self):
+        rng = np.random.default_rng(0)
+        for n, l, u in [(1, 0, 0), (6, 1, 1), (20, 2, 3), (20, 4, 0), (20, 0, 2)]:
+            A = np.triu(np.tril(rng.standard_normal((n, n)), u), -l) + 5 * np.eye(n)
+            B = rng.standard_normal((n, 3))
+            X = ch2.BandedLU(self.band(A, l, u), l, u).solve(B)
+            print("Solved the band \033\13331m(l, u) = ({}, {})\033\1330m of size {}, the residual is \033\13334m{}\033\1330m.".format(l, u, n, np.abs(A @ X - B).max()))
+            assert np.allclose(A @ X, B)
+            assert np.allclose(ch2.BandedLU(self.band(A, l, u), l, u).solve(B[:, 0]), X[:, 0])
+
+    def testBandedCholesky(self):
+        rng = np.random.default_rng(0)
+        for n, l in [(1, 0), (6, 1), (20, 3)]:
+            M = np.triu(np.tril(rng.standard_normal((n, n))), -l)
+            A = M @ M.T + 5 * np.eye(n)
+            B = rng.standard_normal((n, 2))
+            cholesky = ch2.BandedCholesky(self.band(A, 2 * l, 0))
+            assert np.allclose(A @ cholesky.solve(B), B)
+            # the band holds the diagonals of the dense factor
+            assert np.allclose(cholesky.R, self.band(np.linalg.cholesky(A), 2 * l, 0))
+        with pytest.raises(AssertionError):
+            ch2.BandedCholesky(np.array([[1.0, 1.0], [2.0, 0.0]]))
+
+class TestIterative(object):
+    def poisson(self, N: int) -> ch2.CSRMatrix:
+        """The five point Laplacian on a `N x N` grid."""
+        index = np.arange(N * N).reshape(N, N)
+        rows, columns, values = [index.ravel()], [index.ravel()], [np.full(N * N, 4.0)]
+        for source, target in [(index[1:], index[:-1]), (index[:, 1:], index[:, :-1])]:
+            rows += [source.ravel(), target.ravel()]
+            columns += [target.ravel(), source.ravel()]
+            values += [np.full(source.size, -1.0)] * 2
+        return ch2.CSRMatrix.fromCOO(np.concatenate(rows), np.concatenate(columns), np.concatenate(values), (N * N, N * N))
+
+    def testCSRMatrix(self):
+        A = np.array([
+            [4, 0, 1, 0],
+            [0, 3, 0, 0],
+            [2, 0, 5, 1],
+            [0, 0, 1, 2]
+        ])
+        csr = ch2.CSRMatrix.fromDense(A)
+        print("Stored \033\13331m{}\033\1330m as \033\13334m{}, {}, {}\033\1330m.".format(repr(sp.Matrix(A)), csr.data, csr.indices, csr.indptr))
+        assert csr.nnz == 8 and np.array_equal(csr.indptr, [0, 2, 3, 6, 8])
+        assert np.array_equal(csr.toDense(), A) and np.array_equal(csr.diagonal(), np.diag(A))
+        assert np.array_equal(csr.transpose().toDense(), A.T)
+        x = np.arange(8.0).reshape(4, 2)
+        assert np.array_equal(csr @ x, A @ x) and np.array_equal(csr @ x[:, 1], A @ x[:, 1])
+        coo = ch2.CSRMatrix.fromCOO([2, 0, 2, 1, 0, 3, 3, 2, 2], [0, 2, 2, 1, 0, 3, 2, 3, 2], [2, 1, 3, 3, 4, 2, 1, 1, 2], (4, 4))
+        assert np.array_equal(coo.toDense(), A)
+
+    def testStationaryIteration(self):
+        N = 20
+        A = self.poisson(N)
+        b = np.ones(N * N)
+        x = np.linalg.solve(A.toDense(), b)
+        solver = ch2.StationaryIteration(A)
+        iterations = {}
+        for method, args in [("jacobi", ()), ("gaussSeidel", ()), ("sor", (1.7,)), ("ssor", (1.5,))]:
+            result = getattr(solver, method)(b, *args, full_output=True)
+            print("Using \033\13331m{}\033\1330m, \033\13334m{} iterations\033\1330m, the residual is \033\13334m{}\033\1330m.".format(method, result.iterations, result.residual))
+            assert result.converged and np.allclose(result.root, x, atol=1e-6)
+            iterations[method] = result.iterations
+        assert iterations["sor"] < iterations["gaussSeidel"] < iterations["jacobi"]
+
+    def testIncompleteCholesky(self):
+        # no fill-in happens for a tridiagonal matrix, so IC(0) is exact
+        A = np.array([
+            [4, 1, 0, 0],
+            [1, 4, 1, 0],
+            [0, 1, 4, 1],
+            [0, 0, 1, 4]
+        ], dtype=float)
+        R = ch2.incompleteCholesky(ch2.CSRMatrix.fromDense(A))
+        print("Factored \033\13331m{}\033\1330m into \033\13334m{}\033\1330m.".format(repr(sp.Matrix(A)), repr(sp.Matrix(R.toDense()))))
+        assert np.allclose(R.toDense(), np.linalg.cholesky(A))
+        A = self.poisson(5)
+        R = ch2.incompleteCholesky(A).toDense()
+        lower = np.tril(A.toDense())
+        assert np.array_equal(R != 0, lower != 0)
+        assert np.allclose((R @ R.T)[lower != 0], lower[lower != 0])
+
+    def testConjugateGradient(self):
+        N = 20
+        A = self.poisson(N)
+        b = np.ones(N * N)
+        x = np.linalg.solve(A.toDense(), b)
+        iterations = {}
+        for preconditioner in ch2.ConjugateGradient.PRECONDITIONERS:
+            result = ch2.ConjugateGradient(A, preconditioner, omega=1.5).solve(b, rtol=1e-10, full_output=True)
+            print("Using \033\13331m{}\033\1330m, \033\13334m{} iterations\033\1330m, the residual is \033\13334m{}\033\1330m.".format(preconditioner, result.iterations, result.residual))
+            assert result.converged and np.allclose(result.root, x)
+            assert len(result.trace) == result.iterations + 1 and result.trace[-1] <= 1e-10
+            iterations[preconditioner] = result.iterations
+        assert iterations["ssor"] < iterations[None] and iterations["ichol"] < iterations[None]
+        # dense matrices and matrix-vector products go through the same iteration
+        assert np.allclose(ch2.ConjugateGradient(A.toDense(), "ichol").solve(b), x)
+        assert np.allclose(ch2.ConjugateGradient(lambda v: A @ v).solve(b, x=np.ones(N * N)), x)
+        with pytest.raises(AssertionError):
+            ch2.ConjugateGradient(lambda v: A @ v, "jacobi")
+        result = ch2.ConjugateGradient(A).solve(b, max_iterations=5, full_output=True)
+        assert not result.converged and result.iterations == 5
+
+class TestNonlinearSystem(object):
+    def outputNonlinearSystem(self, system: ch2.NonlinearSystem, method: str, x: list, **kwargs):
+        result = getattr(system, method)(x, full_output=True, **kwargs)
+        equations = system.symbol_F if system.symbol_F is not None else "F(x)"
+        print("Using \033\13331m{}\033\1330m on \033\13331m{}\033\1330m: \033\13334m{}\033\1330m.".format(method, equations, result))
+        assert result.converged
+        assert np.allclose(system.numeric_F(result.root), 0.0, atol=1e-12)
+        return result
+
+    def testNonlinearSystem(self):
+        u, v = sp.symbols('u v')
+        system = ch2.NonlinearSystem([v - u ** 3, u ** 2 + v ** 2 - 1], [u, v])
+        self.outputNonlinearSystem(system, "newton", [1, 2])
+        self.outputNonlinearSystem(system, "newton", [1, 2], chord=True)
+        self.outputNonlinearSystem(system, "broyden", [1, 2])
+
+        system = ch2.NonlinearSystem([u ** 2 - 4 * v ** 2 - 4, (u - 1) ** 2 + v ** 2 - 4], [u, v])
+        self.outputNonlinearSystem(system, "newton", [1, 1])
+        self.outputNonlinearSystem(system, "broyden", [1, 1])
+
+        # Broyden's tridiagonal problem, the Jacobian is only evaluated once
+        n = 50
+        x = sp.symbols("x0:{}".format(n))
+        F = [(3 - 2 * x[i]) * x[i] - (x[i - 1] if i > 0 else 0) - 2 * (x[i + 1] if i < n - 1 else 0) + 1 for i in range(n)]
+        system = ch2.NonlinearSystem(F, x)
+        newton = self.outputNonlinearSystem(system, "newton", -np.ones(n))
+        for kwargs in [{"chord": True}, {}]:
+            result = self.outputNonlinearSystem(system, "newton" if kwargs else "broyden", -np.ones(n), **kwargs)
+            assert result.derivative_evaluations == 1 < newton.derivative_evaluations
+            assert np.allclose(result.root, newton.root)
+        # the same system as a function, differentiated with dual numbers
+        def G(x):
+            return [(3 - 2 * x[i]) * x[i] - (x[i - 1] if i > 0 else 0) - 2 * (x[i + 1] if i < n - 1 else 0) + 1 for i in range(n)]
+        automatic = self.outputNonlinearSystem(ch2.NonlinearSystem(G, n), "newton", -np.ones(n))
+        assert np.allclose(automatic.root, newton.root)
+        automatic = self.outputNonlinearSystem(ch2.NonlinearSystem(F, x, derivative="automatic"), "newton", -np.ones(n))
+        assert np.allclose(automatic.root, newton.root)
+        A = np.array([[4.0, 1.0], [1.0, 3.0]])
+        self.outputNonlinearSystem(ch2.NonlinearSystem(lambda x: A @ x - 1.0 + x ** 3, 2), "newton", np.ones(2))
+
+    def testNonlinearSystemBreakdown(self):
+        x, y = sp.symbols('x y')
+        # the Jacobian [[0, 12], [1, 1]] at the start needs a row exchange
+        system = ch2.NonlinearSystem([y ** 3 - 1, x - 2 + y], [x, y])
+        for method in ["newton", "broyden"]:
+            result = self.outputNonlinearSystem(system, method, [0, 2])
+            assert np.allclose(result.root, [1, 1])
+        # the iterate leaves the domain of the logarithm
+        system = ch2.NonlinearSystem(lambda v: [np.log(v[0]), v[1]], 2)
+        with np.errstate(invalid="ignore"):
+            for method in ["newton", "broyden"]:
+                result = getattr(system, method)([5, 1], full_output=True)
+                assert not result.converged and result.iterations == 1
+        # Newton's steps on the arctangent overshoot until its Jacobian is singular in floating point
+        system = ch2.NonlinearSystem([sp.atan(x), y], [x, y])
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            for method in ["newton", "broyden"]:
+                assert getattr(system, method)([3, 0], full_output=True).converged is False
+        # singular at the start
+        assert ch2.NonlinearSystem([x ** 2, y], [x, y]).newton([0, 1], full_output=True).converged is False
+
 if __name__ == "__main__":
     pytest.main(["-s", "test_ch2.py::TestGaussJordan::testGaussJordan"])
+    pytest.main(["-s", "test_ch2.py::TestGaussJordan::testGaussJordanReuse"])
     pytest.main(["-s", "test_ch2.py::TestLU::test_lu"])
+    pytest.main(["-s", "test_ch2.py::TestLU::testLUSolveBlock"])
+    pytest.main(["-s", "test_ch2.py::TestLU::testTriangularSolve"])
+    pytest.main(["-s", "test_ch2.py::TestPLU::testPLU"])
     pytest.main(["-s", "test_ch2.py::TestCholesky::testCholesky"])
+    pytest.main(["-s", "test_ch2.py::TestCholesky::testCholeskyBlocked"])
+    pytest.main(["-s", "test_ch2.py::TestCholesky::testCholeskySolve"])
+    pytest.main(["-s", "test_ch2.py::TestBatch::testGaussJordanBatch"])
+    pytest.main(["-s", "test_ch2.py::TestBatch::testLUBatch"])
+    pytest.main(["-s", "test_ch2.py::TestBatch::testCholeskyBatch"])
+    pytest.main(["-s", "test_ch2.py::TestBanded::testTridiagonal"])
+    pytest.main(["-s", "test_ch2.py::TestBanded::testBandedLU"])
+    pytest.main(["-s", "test_ch2.py::TestBanded::testBandedCholesky"])
+    pytest.main(["-s", "test_ch2.py::TestIterative::testCSRMatrix"])
+    pytest.main(["-s", "test_ch2.py::TestIterative::testStationaryIteration"])
+    pytest.main(["-s", "test_ch2.py::TestIterative::testIncompleteCholesky"])
+    pytest.main(["-s", "test_ch2.py::TestIterative::testConjugateGradient"])
+    pytest.main(["-s", "test_ch2.py::TestNonlinearSystem::testNonlinearSystem"])
+    pytest.main(["-s", "test_ch2.py::TestNonlinearSystem::testNonlinearSystemBreakdown"])
@@ -3,6 +3,7 @@ import os
 import sys
 sys.path.append(os.pardir)
 
+import numpy as np
 import pytest
 import sympy as sp
 import sympy.abc
@@ -70,6 +71,24 @@ class TestCompositeNewtonCotes(object):
         self.outputCompositeNewtonCotes(sp.atan(x) / x, 0.0, 1 / 2.0, 16)
         self.outputCompositeNewtonCotes(sp.atan(x) / x, 0.0, 1 / 2.0, 32)
 
+    def testCompensatedSummation(self):
+        x = sympy.abc.x
+        for summation in ch5.CompositeNewtonCotes.SUMMATION:
+            nc = ch5.CompositeNewtonCotes(sp.exp(x), summation)
+            result = nc(0.0, 1.0, 100000)
+            print("Using \033\13331m{}\033\1330m summation, the results are: \033\13334m{}\033\1330m.".format(summation, result[:3]))
+
+        # The large odd part cancels, so naive summation loses the digits of the constant term
+        f, a, b, m = 1e16 * sp.sin(x) + 1, -3.0, 3.0, 100001
+        h = (b - a) / m
+        y = ch5.CompositeNewtonCotes(f, "naive").numeric_f(np.linspace(a + h / 2.0, b - h / 2.0, m))
+        exact = math.fsum(y) * (b - a) / m
+        midpoint = {summation: ch5.CompositeNewtonCotes(f, summation)._midpoint(a, b, m) for summation in ch5.CompositeNewtonCotes.SUMMATION}
+        print("For \033\13331mf(x) = {}\033\1330m, the midpoint results are: \033\13334m{}\033\1330m.".format(f, midpoint))
+        assert midpoint["neumaier"] == exact
+        assert math.isclose(midpoint["kahan"], exact, rel_tol=1e-3)
+        assert abs(midpoint["naive"] - exact) > 1.0
+
 class TestRomberg(object):
     def outputRomberg(self, f: sp.Function, a: float, b: float, m: int):
         romberg = ch5.Romberg(f)
@@ -131,5 +150,6 @@ class TestGaussLegendre(object):
 if __name__ == "__main__":
     pytest.main(["-s", "test_ch5.py::TestNewtonCotes::testNewtonCotes"])
     pytest.main(["-s", "test_ch5.py::TestCompositeNewtonCotes::testCompositeNewtonCotes"])
+    pytest.main(["-s", "test_ch5.py::TestCompositeNewtonCotes::testCompensatedSummation"])
     pytest.main(["-s", "test_ch5.py::TestRomberg::testRomberg"])
     pytest.main(["-s", "test_ch5.py::TestGaussLegendre::testGaussLegendre"])
@@ -32,6 +32,15 @@ class TestExplicitEuler(object):
 
         self.outputTrapezoidEuler(x * y + x ** 3, 1.0, 10, 0.0, 1.0)
 
+    def testBackend(self):
+        x = sympy.abc.x
+        y = sympy.abc.y
+
+        reference = ch6.EulerMethod(x * y + x ** 3).explicit(1.0, 100)
+        result = ch6.EulerMethod(x * y + x ** 3, backend="math").explicit(1.0, 100)
+        assert abs(result[-1] - reference[-1]) < 1e-12
+
 if __name__ == "__main__":
     # pytest.main(["-s", "test_ch6.py::TestExplicitEuler::testExplicitEuler"])
     pytest.main(["-s", "test_ch6.py::TestExplicitEuler::testTrapezoidEuler"])
+    pytest.main(["-s", "test_ch6.py::TestExplicitEuler::testBackend"])
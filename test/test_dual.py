@@ -0,0 +1,51 @@
+import os
+import sys
+sys.path.append(os.pardir)
+
+import numpy as np
+import pytest
+import sympy as sp
+
+import numana.dual as dual
+
+class TestDual(object):
+    def outputDerivative(self, f: sp.Function, points: np.ndarray) -> None:
+        x = sp.Symbol('x')
+        value, slope = dual.derivative(sp.lambdify(x, f), points)
+        print("Differentiating \033\13331mf(x) = {}\033\1330m at x = {}, the derivatives are \033\13334m{}\033\1330m.".format(f, points, slope))
+        assert np.allclose(value, sp.lambdify(x, f)(points))
+        assert np.allclose(slope, sp.lambdify(x, sp.diff(f, x))(points))
+
+    def testDerivative(self):
+        x = sp.Symbol('x')
+        points = np.linspace(0.1, 0.9, 5)
+        self.outputDerivative(sp.exp(x) * sp.sin(x) / (1 + x ** 2), points)
+        self.outputDerivative(sp.sqrt(x) - 3 ** x + x ** x, points)
+        self.outputDerivative(sp.log(sp.cosh(x)) + sp.atan(x) - sp.asin(x) + sp.tan(x) ** 2, points)
+        value, slope = dual.derivative(lambda x: 2.0, points)
+        assert value.shape == slope.shape == points.shape and not slope.any()
+
+    def testJacobian(self):
+        value, J = dual.jacobian(lambda x: [x[1] - x[0] ** 3, x[0] ** 2 + x[1] ** 2 - 1, 5.0], [1.0, 2.0])
+        print("The Jacobian is \033\13334m{}\033\1330m.".format(J))
+        assert np.array_equal(value, [1.0, 4.0, 5.0])
+        assert np.array_equal(J, [[-3.0, 1.0], [2.0, 4.0], [0.0, 0.0]])
+        # vectorized functions, with numpy arrays on either side
+        value, J = dual.jacobian(lambda x: np.tanh(x) * np.array([1.0, 2.0]) + np.sum(x ** 2), [0.5, -1.0])
+        x = np.array([0.5, -1.0])
+        assert np.allclose(J, np.diag(np.array([1.0, 2.0]) / np.cosh(x) ** 2) + 2.0 * x)
+        # matrix products, with the matrix on either side
+        A = np.array([[2.0, 1.0], [-1.0, 3.0]])
+        value, J = dual.jacobian(lambda x: A @ x - 1.0 + x ** 3, x)
+        assert np.allclose(value, A @ x - 1.0 + x ** 3) and np.allclose(J, A + np.diag(3.0 * x ** 2))
+        value, J = dual.jacobian(lambda x: np.matmul(x, A) + (x @ x), x)
+        assert np.allclose(J, A.T + 2.0 * x)
+        # piecewise functions take the derivative of the selected branch
+        value, J = dual.jacobian(lambda x: np.maximum(x, 0.0) + np.minimum(x, x[::-1]), x)
+        assert np.allclose(J, [[1.0, 1.0], [0.0, 1.0]])
+        value, J = dual.jacobian(lambda x: np.hypot(x, 1.0), x)
+        assert np.allclose(J, np.diag(x / np.hypot(x, 1.0)))
+
+if __name__ == "__main__":
+    pytest.main(["-s", "test_dual.py::TestDual::testDerivative"])
+    pytest.main(["-s", "test_dual.py::TestDual::testJacobian"])